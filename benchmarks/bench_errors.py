@@ -0,0 +1,64 @@
+import timeit
+
+from pyseq.core import ensure
+from pyseq.opt import Opt, OptError
+from pyseq.preconditions import pre, PreconditionError
+
+
+@pre('a', int)
+def checked(a):
+    return a
+
+
+def ensure_failure():
+    try:
+        ensure(False, 'failed')
+    except RuntimeError:
+        pass
+
+
+def opt_get_failure():
+    try:
+        Opt.none().get()
+    except OptError:
+        pass
+
+
+def opt_some_failure():
+    try:
+        Opt.some(None)
+    except OptError:
+        pass
+
+
+def precondition_failure():
+    try:
+        checked('1')
+    except PreconditionError:
+        pass
+
+
+def print_failure():
+    try:
+        ensure(False, 'failed')
+    except RuntimeError as error:
+        str(error)
+
+
+CASES = {
+    'ensure': ensure_failure,
+    'Opt.get': opt_get_failure,
+    'Opt.some': opt_some_failure,
+    'precondition': precondition_failure,
+    'ensure + str(error)': print_failure,
+}
+
+
+def main(number=20000):
+    for name, func in CASES.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print(f'{name:<24} {best / number * 1e6:8.2f} us {number / best:12.0f} raises/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import timeit
+
+from pyseq.functions import getter
+from pyseq.predicates import match, gt
+from pyseq.seq import Seq
+
+RECORD = {'user': {'name': 'Ann', 'orders': [{'total': 10}, {'total': 20}]}, 'id': 7}
+RECORDS = [{'id': i, 'user': {'name': f'user{i}', 'age': i % 90}} for i in range(1000)]
+
+single = getter('id')
+nested = getter('user.orders[1].total')
+multi = getter('id', 'user.name', 'user.orders[0].total')
+adult = match('user.age', gt(17))
+
+CASES = {
+    'getter(path) creation': lambda: getter('user.orders[1].total'),
+    'single key': lambda: single(RECORD),
+    'nested path': lambda: nested(RECORD),
+    'three paths': lambda: multi(RECORD),
+    'match(path, gt)': lambda: adult(RECORDS[20]),
+}
+
+
+def main(number=200000):
+    for name, func in CASES.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print(f'{name:<28} {best / number * 1e6:8.3f} us')
+    best = min(timeit.repeat(lambda: Seq(RECORDS).to_dict(getter('user.name'), getter('id')), number=200, repeat=5))
+    print(f'{"to_dict, 1000 records":<28} {best / 200 * 1e6:8.3f} us')
+
+
+if __name__ == '__main__':
+    main()
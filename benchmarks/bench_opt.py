@@ -0,0 +1,51 @@
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+
+from pyseq.opt import Opt
+from pyseq.seq import Seq
+
+OBJ = SimpleNamespace(user=SimpleNamespace(address=SimpleNamespace(city='Oslo')))
+DCT = {'user': {'address': {'city': 'Oslo'}}}
+NUMBERS = list(range(1000))
+
+
+def half(x):
+    return Opt.some(x // 2) if x % 2 == 0 else Opt.none()
+
+
+CASES = {
+    'Opt.some(x)': lambda: Opt.some(1),
+    'Opt.none()': lambda: Opt.none(),
+    'map.filter.get_or': lambda: Opt.of(3).map(lambda x: x + 1).filter(lambda x: x > 2).get_or(0),
+    'getattr (3 levels)': lambda: Opt.of(OBJ).getattr('user', 'address', 'city'),
+    'getitem (3 levels)': lambda: Opt.of(DCT).getitem('user', 'address', 'city'),
+    'getitem, missing': lambda: Opt.of(DCT).getitem('user', 'phone', 'number'),
+    'Seq.filter_map, 1000': lambda: Seq(NUMBERS).filter_map(half).to_list(),
+    'Seq.min, 1000': lambda: Seq(NUMBERS).min(),
+    'Seq.last, 1000': lambda: Seq(NUMBERS).last(),
+}
+
+
+def memory(count=100000):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    opts = [Opt.of(i) for i in range(count)] + [Opt.none() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    size -= sum(map(int.__sizeof__, range(count)))  # the values themselves
+    del opts
+    return size / (2 * count)
+
+
+def main(number=20000):
+    for name, func in CASES.items():
+        n = number // 100 if 'Seq' in name else number
+        best = min(timeit.repeat(func, number=n, repeat=5))
+        print(f'{name:<28} {best / n * 1e6:8.3f} us')
+    print(f'{"memory per Opt":<28} {memory():8.1f} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+import sys
+import timeit
+
+from pyseq.seq import Seq
+
+SMALL = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+
+CASES = {
+    'Seq(list)': lambda: Seq(SMALL),
+    'build map.filter.map': lambda: Seq(SMALL).map(lambda x: x + 1).filter(lambda x: x % 2).map(str),
+    'build take_if.drop_if.take_until': lambda: Seq(SMALL).take_if(lambda x: x > 1).drop_if(lambda x: x > 8)
+    .take_until(lambda x: x == 6),
+    'build append.flat_map.take': lambda: Seq(SMALL).append(7).flat_map(lambda x: (x, x)).take(5),
+    'run map.filter.to_list': lambda: Seq(SMALL).map(lambda x: x + 1).filter(lambda x: x % 2).to_list(),
+    'run take_until.append.to_list': lambda: Seq(SMALL).take_until(lambda x: x == 6).append(0).to_list(),
+}
+
+
+def main(number=50000):
+    for name, func in CASES.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print(f'{name:<36} {best / number * 1e6:8.3f} us')
+    seq = Seq(SMALL).map(str)
+    size = sys.getsizeof(seq) + (sys.getsizeof(seq.__dict__) if hasattr(seq, '__dict__') else 0)
+    print(f'{"size of a Seq":<36} {size:8d} bytes')
+
+
+if __name__ == '__main__':
+    main()
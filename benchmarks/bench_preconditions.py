@@ -0,0 +1,45 @@
+import timeit
+
+from pyseq.predicates import gt
+from pyseq.preconditions import check_annotation, pre, post, set_checking_policy, ALWAYS, SAMPLED, OFF
+
+
+def plain(a, b, scale=1.0):
+    return (a + b) * scale
+
+
+def define():
+    @check_annotation
+    def annotated(a: int, b: [int, gt(0)], scale: float = 1.0) -> (int, float):
+        return (a + b) * scale
+
+    @pre('a', int)
+    @post(float)
+    def decorated(a, b, scale=1.0):
+        return (a + b) * scale
+
+    return annotated, decorated
+
+
+def cases():
+    result = {'undecorated': lambda: plain(1, 2)}
+    for mode, sample_every in [(ALWAYS, 1), (SAMPLED, 100), (OFF, 1)]:
+        set_checking_policy(mode, sample_every)
+        annotated, decorated = define()
+        result.update({
+            f'check_annotation [{mode}]': lambda f=annotated: f(1, 2),
+            f'check_annotation, keyword [{mode}]': lambda f=annotated: f(1, b=2, scale=2.0),
+            f'@pre/@post [{mode}]': lambda f=decorated: f(1, 2),
+        })
+    set_checking_policy(ALWAYS)
+    return result
+
+
+def main(number=100000):
+    for name, func in cases().items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print(f'{name:<40} {best / number * 1e6:8.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+import timeit
+
+from pyseq.predicates import eq, between, gt, lt, any_of, matches, Predicate
+
+p, q = gt(0), lt(10)
+
+CASES = {
+    'eq(5)': lambda: eq(5),
+    'between(1, 9)': lambda: between(1, 9),
+    'p & q': lambda: p & q,
+    '~p': lambda: ~p,
+    'Predicate.all(p, q, p)': lambda: Predicate.all(p, q, p),
+    'user filter': lambda: matches({'a': between(1, 9) & ~eq(5), 'b.c': any_of(1, 2, 3) | gt(100)}),
+}
+
+
+def main(number=20000):
+    for name, func in CASES.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print(f'{name:<26} {best / number * 1e6:8.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import operator
+import sys
+
+from pyseq.core import ensure
+from pyseq.functions import identity
+from pyseq.opt import Opt
+from pyseq.seq import Seq, _is_ndarray
+
+_KERNELS = {
+    'eq': lambda a, value: a == value,
+    'ne': lambda a, value: a != value,
+    'lt': lambda a, value: a < value,
+    'le': lambda a, value: a <= value,
+    'gt': lambda a, value: a > value,
+    'ge': lambda a, value: a >= value,
+    'between': lambda a, lo, up: (lo <= a) & (a <= up),
+    'divisible_by': lambda a, d: a % d == 0,
+    'any_of': lambda a, values: _numpy().isin(a, values),
+}
+
+
+def _numpy():
+    import numpy
+    return numpy
+
+
+def _is_ufunc(func):
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(func, numpy.ufunc)
+
+
+_SCALAR_TYPES = (bool, int, float, complex, str, bytes)
+
+
+def _is_scalar(value):
+    numpy = sys.modules.get('numpy')
+    return isinstance(value, _SCALAR_TYPES) or (numpy is not None and isinstance(value, numpy.generic))
+
+
+def _is_numeric(array):
+    return array.dtype.kind in 'biufc'
+
+
+def _kernel(pred):
+    spec = getattr(pred, '_spec', None)
+    if spec is not None and spec[0] in _KERNELS:
+        # a kernel would broadcast a list or an array constant instead of comparing each item with it as a whole
+        values = spec[1] if spec[0] == 'any_of' else spec[1:]
+        if all(map(_is_scalar, values)):
+            return lambda a: _KERNELS[spec[0]](a, *spec[1:])
+    if _is_ufunc(pred):
+        return pred
+    return None
+
+
+class ArraySeq(Seq):
+    __slots__ = ()
+
+    def __init__(self, array):
+        array = array if _is_ndarray(array) else _numpy().asarray(array)
+        ensure(array.ndim == 1, lambda: f'one-dimensional array expected, got {array.ndim} dimensions',
+               error_type=ValueError, stack_level=2)
+        super().__init__(array)
+
+    @property
+    def array(self):
+        return self._source
+
+    def len(self):
+        return len(self._source)
+
+    def map(self, func, vectorized=False):
+        if vectorized or _is_ufunc(func):
+            return ArraySeq(func(self._source))
+        return super().map(func)
+
+    def filter(self, pred, vectorized=False):
+        kernel = pred if vectorized else _kernel(pred)
+        if kernel is not None:
+            return ArraySeq(self._source[kernel(self._source)])
+        return super().filter(pred)
+
+    def take_if(self, pred, vectorized=False):
+        return self.filter(pred, vectorized=vectorized)
+
+    def drop_if(self, pred, vectorized=False):
+        kernel = pred if vectorized else _kernel(pred)
+        if kernel is not None:
+            return ArraySeq(self._source[~kernel(self._source)])
+        return super().drop_if(pred)
+
+    def take(self, n):
+        return ArraySeq(self._source[:n])
+
+    def drop(self, n):
+        return ArraySeq(self._source[n:])
+
+    def reverse(self):
+        return ArraySeq(self._source[::-1])
+
+    def sort(self, key=identity, run_size=None):
+        ensure(run_size is None or run_size > 0, 'sort: positive run_size expected', error_type=ValueError,
+               stack_level=2)
+        if key is identity and run_size is None:
+            return ArraySeq(_numpy().sort(self._source, kind='stable'))
+        return super().sort(key, run_size=run_size)
+
+    def adjacent_difference(self, func=None):
+        if func is None or func is operator.sub:
+            return ArraySeq(_numpy().diff(self._source))
+        return super().adjacent_difference(func)
+
+    def sum(self, init=0):
+        if not _is_numeric(self._source):  # e.g. an object array of str
+            return super().sum(init)
+        return init + self._source.sum().item()
+
+    def min(self, key=identity):
+        if key is not identity or not _is_numeric(self._source):
+            return super().min(key)
+        return Opt.of(self._source.min().item()) if self._source.size else Opt.none()
+
+    def max(self, key=identity):
+        if key is not identity or not _is_numeric(self._source):
+            return super().max(key)
+        return Opt.of(self._source.max().item()) if self._source.size else Opt.none()
+
+    def to_list(self):
+        return self._source.tolist()
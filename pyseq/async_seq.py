@@ -0,0 +1,226 @@
+import asyncio
+import inspect
+from collections import deque
+from functools import wraps
+
+from pyseq.core import ensure
+from pyseq.functions import identity, to_unary
+from pyseq.opt import Opt
+from pyseq.seq import Seq, _adjust_selectors
+
+
+def as_async_seq(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return _own(func(*args, **kwargs))
+
+    return wrapper
+
+
+def _own(iterable):
+    # an async generator of AsyncSeq itself, unlike an iterator of the caller it may be closed early
+    seq = AsyncSeq(iterable)
+    seq._owned = True
+    return seq
+
+
+async def _resolve(value):
+    return await value if inspect.isawaitable(value) else value
+
+
+async def _aclose(seq):
+    # stops the upstream work, e.g. the tasks of a concurrent map, once nothing more will be read
+    aclose = getattr(seq._iterable, 'aclose', None) if seq._owned else None
+    if aclose is not None:
+        await aclose()
+
+
+async def _from_iterable(iterable):
+    for item in iterable:
+        yield item
+
+
+async def _map(seq, func):
+    try:
+        async for item in seq._iterable:
+            yield await _resolve(func(item))
+    finally:
+        await _aclose(seq)
+
+
+async def _map_concurrently(seq, func, concurrency, ordered):
+    pending = deque() if ordered else set()
+    source = seq._iterable.__aiter__()
+    exhausted = False
+
+    async def fill():
+        nonlocal exhausted
+        while not exhausted and len(pending) < concurrency:
+            try:
+                item = await source.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                return
+            value = func(item)
+            # an awaitable becomes the task itself, so that cancelling it before it starts also closes it
+            task = asyncio.ensure_future(value if inspect.isawaitable(value) else _resolve(value))
+            if ordered:
+                pending.append(task)
+            else:
+                pending.add(task)
+
+    try:
+        await fill()
+        while pending:
+            if ordered:
+                await asyncio.wait((pending[0],))
+                done = (pending.popleft(),)
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+
+            await fill()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        # wait for the cancellations, so that no task outlives the consumer
+        await asyncio.gather(*pending, return_exceptions=True)
+        await _aclose(seq)
+
+
+class AsyncSeq:
+    def __init__(self, iterable):
+        owned = False
+        if isinstance(iterable, AsyncSeq):
+            iterable, owned = iterable._iterable, iterable._owned
+        elif not hasattr(iterable, '__aiter__'):
+            iterable = _from_iterable(iterable)
+        self._iterable = iterable
+        self._owned = owned
+
+    def __aiter__(self):
+        return self._iterable.__aiter__()
+
+    @staticmethod
+    def from_iterable(iterable):
+        return AsyncSeq(iterable)
+
+    def map(self, func, concurrency=1, ordered=True):
+        ensure(concurrency > 0, 'concurrency: positive value expected', error_type=ValueError, stack_level=2)
+        func = to_unary(func)
+        if concurrency == 1:
+            return _own(_map(self, func))
+        else:
+            return _own(_map_concurrently(self, func, concurrency, ordered))
+
+    @as_async_seq
+    async def filter(self, pred):
+        pred = to_unary(pred)
+        try:
+            async for item in self._iterable:
+                if await _resolve(pred(item)):
+                    yield item
+        finally:
+            await _aclose(self)
+
+    def take_if(self, pred):
+        return self.filter(pred)
+
+    @as_async_seq
+    async def take(self, n):
+        try:
+            if n <= 0:
+                return
+            count = 0
+            async for item in self._iterable:
+                yield item
+                count += 1
+                if count >= n:
+                    return
+        finally:
+            await _aclose(self)
+
+    @as_async_seq
+    async def drop(self, n):
+        count = 0
+        try:
+            async for item in self._iterable:
+                if count >= n:
+                    yield item
+                else:
+                    count += 1
+        finally:
+            await _aclose(self)
+
+    @as_async_seq
+    async def enumerate(self, start=0):
+        index = start
+        try:
+            async for item in self._iterable:
+                yield index, item
+                index += 1
+        finally:
+            await _aclose(self)
+
+    @as_async_seq
+    async def chunk(self, chunk_size):
+        buf = []
+        try:
+            async for item in self._iterable:
+                buf.append(item)
+                # a full chunk is yielded right away, without waiting for the next item
+                if len(buf) == chunk_size:
+                    yield buf
+                    buf = []
+            if buf:
+                yield buf
+        finally:
+            await _aclose(self)
+
+    @as_async_seq
+    async def group_by(self, key_selector=None, value_selector=None, result_selector=None):
+        result_selector = result_selector or identity
+        groups = await self.to_multidict(key_selector=key_selector, value_selector=value_selector)
+        for key, values in groups.items():
+            yield key, result_selector(Seq(values))
+
+    async def first(self):
+        try:
+            async for item in self._iterable:
+                return Opt.of(item)
+            return Opt.none()
+        finally:
+            await _aclose(self)
+
+    async def for_each(self, func):
+        func = to_unary(func)
+        async for item in self._iterable:
+            await _resolve(func(item))
+
+    async def to(self, container):
+        return container([item async for item in self._iterable])
+
+    async def to_list(self):
+        return await self.to(list)
+
+    async def to_set(self):
+        return await self.to(set)
+
+    async def to_tuple(self):
+        return await self.to(tuple)
+
+    async def to_seq(self):
+        return Seq(await self.to_list())
+
+    async def to_dict(self, key_selector=None, value_selector=None):
+        key_selector, value_selector = _adjust_selectors(key_selector, value_selector)
+        return {key_selector(item): value_selector(item) async for item in self._iterable}
+
+    async def to_multidict(self, key_selector=None, value_selector=None):
+        key_selector, value_selector = _adjust_selectors(key_selector, value_selector)
+        res = {}
+        async for item in self._iterable:
+            res.setdefault(key_selector(item), []).append(value_selector(item))
+        return res
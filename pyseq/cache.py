@@ -0,0 +1,51 @@
+import threading
+from collections import deque
+
+from pyseq.core import ensure
+
+_missing = object()
+
+
+class CachedIterable:
+    def __init__(self, iterable, max_size=None):
+        self._it = iter(iterable)
+        self._buffer = deque()
+        self._offset = 0  # position of self._buffer[0] in the whole sequence
+        self._max_size = max_size
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def _fetch(self, index):
+        while not self._exhausted and index >= self._offset + len(self._buffer):
+            item = next(self._it, _missing)
+            if item is _missing:
+                self._exhausted = True
+                self._it = None
+                break
+            self._buffer.append(item)
+            if self._max_size is not None and len(self._buffer) > self._max_size:
+                self._buffer.popleft()
+                self._offset += 1
+
+    def _get(self, index):
+        # the position is computed and the item read under the lock, another iterator may evict items meanwhile
+        with self._lock:
+            pos = index - self._offset
+            if pos >= len(self._buffer):
+                self._fetch(index)
+                pos = index - self._offset
+                if pos >= len(self._buffer):
+                    return _missing
+            ensure(pos >= 0,
+                   lambda: f'item {index} was evicted from a cache of {self._max_size} items',
+                   error_type=BufferError, stack_level=2)
+            return self._buffer[pos]
+
+    def __iter__(self):
+        index = 0
+        while True:
+            item = self._get(index)
+            if item is _missing:
+                return
+            yield item
+            index += 1
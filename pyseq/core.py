@@ -1,11 +1,32 @@
-import inspect
+import sys
 
 
-def _format_frame_info(frame, stack_level=0):
-    for _ in range(stack_level):
-        frame = frame.f_back
-    file_name, line_number, function_name, *_ = inspect.getframeinfo(frame)
-    return f'File "{file_name}", line {line_number}, in {function_name}'
+class _Location:
+    # only the code object and the line number are captured when raising, the text is built when it is printed
+    __slots__ = ('_code', '_line_number')
+
+    def __init__(self, frame):
+        self._code = frame.f_code
+        self._line_number = frame.f_lineno
+
+    def __str__(self):
+        return f'File "{self._code.co_filename}", line {self._line_number}, in {self._code.co_name}'
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        return str(self) == other if isinstance(other, str) else NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __contains__(self, item):
+        return item in str(self)
+
+    def __reduce__(self):
+        # code objects cannot be pickled, e.g. to send the exception back from a process pool
+        return str, (str(self),)
 
 
 def ensure(cond, error=None, error_type=RuntimeError, stack_level=1):
@@ -18,7 +39,7 @@ def ensure(cond, error=None, error_type=RuntimeError, stack_level=1):
     if callable(error):
         error = error()
 
-    loc = _format_frame_info(inspect.currentframe(), stack_level=stack_level)
+    loc = _Location(sys._getframe(stack_level))
 
     if isinstance(error, Exception):
         exception = error
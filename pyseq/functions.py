@@ -1,5 +1,12 @@
 import functools
-from operator import itemgetter
+import inspect
+import keyword
+import weakref
+from collections import namedtuple
+from inspect import Parameter
+from operator import attrgetter, itemgetter
+from types import FunctionType, MethodType, MethodDescriptorType, WrapperDescriptorType, ClassMethodDescriptorType, \
+    BuiltinFunctionType, ModuleType
 
 
 def do_nothing(*args, **kwargs):
@@ -41,26 +48,108 @@ def unpack(func):
     return lambda arg: func(*arg)
 
 
-def to_unary(func):
-    import inspect
-    from inspect import Parameter
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'uncached', 'maxsize', 'currsize'])
+
 
+def _is_multi_arg(func):
     def is_valid(p):
         return p.kind in [Parameter.POSITIONAL_OR_KEYWORD] and p.default is p.empty
 
-    if func is None:
-        return identity
-
     try:
-        if sum(1 for p in inspect.signature(func).parameters.values() if is_valid(p)) > 1:
-            return unpack(func)
-        else:
+        return sum(1 for p in inspect.signature(func).parameters.values() if is_valid(p)) > 1
+    except (TypeError, ValueError):
+        return False
+
+
+def _has_plain_signature(func):
+    return type(func) is FunctionType and '__wrapped__' not in func.__dict__ and '__signature__' not in func.__dict__
+
+
+_DESCRIPTOR_TYPES = (MethodDescriptorType, WrapperDescriptorType, ClassMethodDescriptorType)
+
+
+class _ArityCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    @staticmethod
+    def _code_key(func):
+        # closures created from the same definition share the code object, so they share the entry as well
+        return func.__code__, len(func.__defaults__ or ())
+
+    def _key(self, func, callback=None):
+        if _has_plain_signature(func):
+            return self._code_key(func)
+        if type(func) is MethodType and _has_plain_signature(func.__func__):
+            return (MethodType,) + self._code_key(func.__func__)
+        if type(func) in _DESCRIPTOR_TYPES:
+            # unbound methods of builtin types (e.g. str.upper) live as long as their type, and cannot be weakly
+            # referenced
+            return func
+        if type(func) is BuiltinFunctionType and isinstance(func.__self__, ModuleType):
+            # module level builtins (e.g. len) live as long as their module, and cannot be weakly referenced either
             return func
+        key = weakref.ref(func, callback)
+        hash(key)
+        return key
+
+    def _discard(self, key):
+        self._entries.pop(key, None)
+
+    def is_multi_arg(self, func):
+        try:
+            key = self._key(func)
+        except TypeError:
+            self.uncached += 1
+            return _is_multi_arg(func)
+
+        try:
+            result = self._entries[key]
+            self.hits += 1
+            return result
+        except KeyError:
+            pass
+
+        self.misses += 1
+        result = _is_multi_arg(func)
+        if isinstance(key, weakref.ref):
+            key = self._key(func, self._discard)
+        if len(self._entries) >= self.maxsize:
+            self._discard(next(iter(self._entries), None))
+        self._entries[key] = result
+        return result
 
-    except (TypeError, ValueError):
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.uncached, self.maxsize, len(self._entries))
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+
+_arity_cache = _ArityCache()
+
+
+def to_unary(func):
+    if func is None:
+        return identity
+
+    if _arity_cache.is_multi_arg(func):
+        return unpack(func)
+    else:
         return func
 
 
+to_unary.cache_info = _arity_cache.info
+to_unary.cache_clear = _arity_cache.clear
+
+
 # noinspection PyPep8Naming
 class indexed:
     def __init__(self, func, start=0):
@@ -73,6 +162,19 @@ class indexed:
         return result
 
 
+# noinspection PyPep8Naming
+class aggregate:
+    def __init__(self, step, init=None, finish=identity):
+        self.step = step
+        self.init = init
+        self.finish = finish
+
+    def start(self, value):
+        if self.init is None:
+            return value
+        return self.step(self.init(), value)
+
+
 def associate(func):
     def result(item):
         return item, func(item)
@@ -88,34 +190,92 @@ def update_dict_value(func):
     return result
 
 
+# noinspection PyPep8Naming
+class attr:
+    # a path key read with getattr instead of item[key], written as '[@name]' in getter paths; like any other
+    # non-integer in brackets this used to be an error, so it cannot change what an existing path reads
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, attr) and self.name == other.name
+
+    def __hash__(self):
+        return hash((attr, self.name))
+
+    def __str__(self):
+        return f'[@{self.name}]'
+
+    __repr__ = __str__
+
+
+def _is_plain_attr(key):
+    return isinstance(key, attr) and key.name.isidentifier() and not keyword.iskeyword(key.name)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_path(keys):
+    if not keys:
+        return identity
+    if all(_is_plain_attr(key) for key in keys):
+        return attrgetter('.'.join(key.name for key in keys))
+    if len(keys) == 1:
+        return itemgetter(keys[0])
+
+    namespace = {}
+    expr = 'item'
+    for index, key in enumerate(keys):
+        if _is_plain_attr(key):
+            expr = f'{expr}.{key.name}'
+        elif isinstance(key, attr):
+            namespace[f'_k{index}'] = key.name
+            expr = f'getattr({expr}, _k{index})'
+        else:
+            namespace[f'_k{index}'] = key
+            expr = f'{expr}[_k{index}]'
+    exec(f'def get(item):\n    return {expr}', namespace)
+    return namespace['get']
+
+
 # noinspection PyPep8Naming
 class nested_getter:
     def __init__(self, *keys):
         self._keys = keys
+        try:
+            self._get = _compile_path(keys)
+        except TypeError:  # unhashable key, e.g. a slice
+            self._get = _compile_path.__wrapped__(keys)
         self.__name__ = '.'.join(map(str, self._keys))
 
     def __call__(self, item):
-        for key in self._keys:
-            item = item[key]
-        return item
+        return self._get(item)
 
     def __repr__(self):
         return self.__name__
 
 
+def _unwrap(func):
+    # the function doing the work, without the extra call through nested_getter or apply
+    if isinstance(func, nested_getter):
+        return func._get
+    if isinstance(func, apply):
+        return func._func
+    return func
+
+
 # noinspection PyPep8Naming
 class apply:
     def __init__(self, func, *funcs):
+        self.all_funcs = (func,) + funcs
         if funcs:
-            self.all_funcs = (func,) + funcs
-
-            def result(item):
-                return tuple(f(item) for f in self.all_funcs)
-
-            self._func = result
+            namespace = {f'_f{index}': _unwrap(f) for index, f in enumerate(self.all_funcs)}
+            exec('def result(item):\n    return ({},)'.format(', '.join(f'{name}(item)' for name in namespace)),
+                 namespace)
+            self._func = namespace['result']
         else:
-            self.all_funcs = (func,)
-            self._func = func
+            self._func = _unwrap(func)
 
         self.__name__ = ';'.join(f.__name__ for f in self.all_funcs)
 
@@ -126,17 +286,33 @@ class apply:
         return self.__name__
 
 
-def split_path(path, delimiter='.'):
-    path = path.replace('[', f'{delimiter}[')
+def getter_key(func):
+    # getters reading the same path compare equal under this key, whatever object implements them
+    if isinstance(func, apply) and len(func.all_funcs) == 1:
+        func = func.all_funcs[0]
+    if isinstance(func, nested_getter):
+        return nested_getter, func._keys
+    return func
+
 
+@functools.lru_cache(maxsize=1024)
+def _split_path(path, delimiter):
     def adjust(value):
-        if value.startswith('[') and value.endswith(']'):
+        if value.startswith('[@') and value.endswith(']'):
+            return attr(value[2:-1])
+        elif value.startswith('[') and value.endswith(']'):
             return int(value[1:-1])
         else:
             return value
 
-    chunks = map(adjust, path.split(delimiter))
-    return chunks
+    chunks = path.replace('[', f'{delimiter}[').split(delimiter)
+    if path.startswith('['):
+        chunks = chunks[1:]
+    return tuple(map(adjust, chunks))
+
+
+def split_path(path, delimiter='.'):
+    return _split_path(path, delimiter)
 
 
 def getter(*paths, delimiter='.'):
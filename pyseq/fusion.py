@@ -0,0 +1,53 @@
+import itertools
+
+_TEMPLATES = {
+    'map': ['item = a{n}(item)'],
+    'filter': ['if not a{n}(item):', '    continue'],
+    'drop': ['if a{n}(item):', '    continue'],
+    'replace_if': ['if a{n}(item):', '    item = b{n}'],
+    'replace': ['if item == a{n}:', '    item = b{n}'],
+}
+
+_compiled = {}
+
+
+def _compile(kinds):
+    params = ', '.join(f'a{n}, b{n}' for n in range(len(kinds)))
+    lines = [f'def fused(source, finished, {params}):', '    for item in source:']
+    for n, kind in enumerate(kinds):
+        lines.extend(f'        {line.format(n=n)}' for line in _TEMPLATES[kind])
+    lines.append('        yield item')
+    lines.append('    finished.append(True)')
+
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['fused']
+
+
+def fuse(source, stages):
+    if len(stages) == 1:
+        kind, a, _ = stages[0]
+        if kind == 'map':
+            return map(a, source)
+        if kind == 'filter':
+            return filter(a, source)
+
+    kinds = tuple(kind for kind, _, _ in stages)
+    try:
+        func = _compiled[kinds]
+    except KeyError:
+        func = _compiled.setdefault(kinds, _compile(kinds))
+
+    args = []
+    for _, a, b in stages:
+        args.append(a)
+        args.append(b)
+    return itertools.chain.from_iterable(_restarting(func, iter(source), args))
+
+
+def _restarting(func, source, args):
+    # a generator is finished once a stage raises, while a map/filter chain goes on with the next item; a new fused
+    # generator over the same source is started until one runs through to the end
+    finished = []
+    while not finished:
+        yield func(source, finished, *args)
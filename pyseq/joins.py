@@ -0,0 +1,77 @@
+_missing = object()
+
+
+def _sized_len(iterable):
+    try:
+        return len(iterable)
+    except TypeError:
+        return None
+
+
+def build_index(iterable, key):
+    index = {}
+    for item in iterable:
+        index.setdefault(key(item), []).append(item)
+    return index
+
+
+def hash_join(left, right, left_key, right_key):
+    left_len, right_len = _sized_len(left), _sized_len(right)
+    if left_len is not None and right_len is not None and left_len < right_len:
+        # index the smaller side; the output then follows the order of the right side, and within a key that of
+        # the left side
+        index = build_index(left, left_key)
+        for r in right:
+            for l in index.get(right_key(r), ()):
+                yield l, r
+    else:
+        index = build_index(right, right_key)
+        for l in left:
+            for r in index.get(left_key(l), ()):
+                yield l, r
+
+
+def left_join(left, right, left_key, right_key, default=None):
+    index = build_index(right, right_key)
+    for l in left:
+        matches = index.get(left_key(l))
+        if matches:
+            for r in matches:
+                yield l, r
+        else:
+            yield l, default
+
+
+def semi_join(left, right, left_key, right_key):
+    keys = {right_key(r) for r in right}
+    for l in left:
+        if left_key(l) in keys:
+            yield l
+
+
+def anti_join(left, right, left_key, right_key):
+    keys = {right_key(r) for r in right}
+    for l in left:
+        if left_key(l) not in keys:
+            yield l
+
+
+def merge_join(left, right, left_key, right_key):
+    # both inputs have to be sorted by their keys; runs of equal keys on the right side are buffered
+    right = iter(right)
+    r = next(right, _missing)
+    rk = right_key(r) if r is not _missing else None
+    run_key, run = _missing, []
+    for l in left:
+        k = left_key(l)
+        if run_key is _missing or k != run_key:
+            while r is not _missing and rk < k:
+                r = next(right, _missing)
+                rk = right_key(r) if r is not _missing else None
+            run_key, run = k, []
+            while r is not _missing and rk == k:
+                run.append(r)
+                r = next(right, _missing)
+                rk = right_key(r) if r is not _missing else None
+        for m in run:
+            yield l, m
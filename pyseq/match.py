@@ -1,4 +1,6 @@
-from pyseq.predicates import Predicate, always
+import inspect
+
+from pyseq.predicates import Predicate, always, compile_first_match
 
 
 class MatchError(Exception):
@@ -9,14 +11,34 @@ def _is_type(o):
     return isinstance(o, type)
 
 
-def _try_invoke(func, item):
+def _is_nullary(func):
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        return False
+    try:
+        signature.bind(None)
+        return False
+    except TypeError:
+        pass
     try:
-        return func(item)
+        signature.bind()
+        return True
     except TypeError:
-        return func()
+        return False
+
+
+def _as_unary(func):
+    # handlers may ignore the matched item; this is decided once here rather than by catching TypeError per call
+    if _is_nullary(func):
+        return lambda _item: func()
+    return func
 
 
 def _convert_pred(pred):
+    if _is_type(pred):
+        # Predicate would treat a class as a plain callable
+        return Predicate((pred,))
     return Predicate(pred)
 
 
@@ -31,12 +53,12 @@ class _Handler:
     def __init__(self, pred, func):
         self._pred = _convert_pred(pred)
         self._func = _convert_func(func)
+        self.matches = _as_unary(self._pred._pred)
+        self.get_result = _as_unary(self._func)
 
-    def matches(self, item):
-        return _try_invoke(self._pred, item)
-
-    def get_result(self, item):
-        return _try_invoke(self._func, item)
+    @property
+    def spec(self):
+        return self._pred._spec
 
 
 class _When:
@@ -70,8 +92,81 @@ def match(item, *handlers):
     raise MatchError("No match")
 
 
-def create_matcher(*handlers):
-    def result(item):
-        return match(item, *handlers)
-
-    return result
+_missing = object()
+
+
+def _literal_key(spec):
+    if spec is not None and spec[0] == 'eq':
+        value = spec[1]
+        try:
+            hash(value)
+        except TypeError:
+            return _missing
+        # a dict finds NaN by identity, while == never matches it
+        if value == value:
+            return value
+    return _missing
+
+
+class _Matcher:
+    def __init__(self, handlers, share_getters=False):
+        _validate_handlers(*handlers)
+        self._handlers = handlers
+        self._types = []  # (index, type or tuple of types)
+        self._literals = {}  # value -> index of the first handler comparing equal to it
+        self._linear = []  # (index, handler) for the predicates that have to be evaluated
+        self._type_cache = {}
+
+        for index, handler in enumerate(handlers):
+            spec = handler.spec
+            literal = _literal_key(spec)
+            if spec is not None and spec[0] == 'of_type':
+                self._types.append((index, spec[1]))
+            elif literal is not _missing:
+                self._literals.setdefault(literal, index)
+            else:
+                self._linear.append((index, handler))
+
+        self._find = None
+        if share_getters and self._linear:
+            self._find = compile_first_match(
+                (index, handler._pred if handler.spec is not None else handler.matches)
+                for index, handler in self._linear)
+
+    def _type_index(self, cls):
+        try:
+            return self._type_cache[cls]
+        except KeyError:
+            pass
+        index = next((i for i, types in self._types if issubclass(cls, types)), len(self._handlers))
+        self._type_cache[cls] = index
+        return index
+
+    def _literal_index(self, item):
+        try:
+            return self._literals.get(item, len(self._handlers))
+        except TypeError:  # unhashable item, compare it with every literal
+            return min((i for value, i in self._literals.items() if item == value), default=len(self._handlers))
+
+    def __call__(self, item):
+        best = self._literal_index(item) if self._literals else len(self._handlers)
+        if self._types:
+            best = min(best, self._type_index(type(item)))
+
+        if self._find is not None:
+            best = self._find(item, best)
+        else:
+            for index, handler in self._linear:
+                if index >= best:
+                    break
+                if handler.matches(item):
+                    return handler.get_result(item)
+
+        if best < len(self._handlers):
+            return self._handlers[best].get_result(item)
+
+        raise MatchError("No match")
+
+
+def create_matcher(*handlers, share_getters=False):
+    return _Matcher(handlers, share_getters=share_getters)
@@ -7,8 +7,21 @@ class OptError(Exception):
 
 
 class Opt:
-    def __init__(self, value=None):
-        self._value = value._value if isinstance(value, Opt) else value
+    __slots__ = ('_value',)
+
+    def __new__(cls, value=None):
+        if isinstance(value, Opt):
+            value = value._value
+        if value is None and cls is Opt:
+            # there is only one empty Opt
+            return _none
+        self = object.__new__(cls)
+        self._value = value
+        return self
+
+    def __reduce__(self):
+        # keeps pickle and copy going through __new__, which must not refill the shared empty Opt
+        return Opt, (self._value,)
 
     def __str__(self):
         return f'some({self._value})' if self else 'none'
@@ -21,7 +34,8 @@ class Opt:
 
     @staticmethod
     def some(value):
-        ensure(value is not None, lambda: OptError('value expected, got None'), stack_level=2)
+        if value is None:
+            ensure(False, lambda: OptError('value expected, got None'), stack_level=2)
         return Opt(value)
 
     @staticmethod
@@ -36,7 +50,7 @@ class Opt:
 
     @staticmethod
     def none():
-        return Opt()
+        return _none
 
     def or_else(self, func):
         if self:
@@ -47,17 +61,18 @@ class Opt:
             return res
 
     def get_or(self, default_value):
-        return self._value if self else default_value
+        return self._value if self._value is not None else default_value
 
     def get_or_else(self, func):
-        return self._value if self else func()
+        return self._value if self._value is not None else func()
 
     def get_or_raise(self, exception):
-        ensure(self, exception, error_type=OptError)
+        if self._value is None:
+            ensure(False, exception, error_type=OptError)
         return self._value
 
     def get_or_none(self):
-        return self.get_or(None)
+        return self._value
 
     def get(self):
         return self.get_or_raise('empty optional')
@@ -66,38 +81,46 @@ class Opt:
         return self._value is not None
 
     def is_none(self):
-        return not self.is_some()
+        return self._value is None
 
     def __bool__(self):
-        return self.is_some()
+        return self._value is not None
 
     def map(self, func):
-        func = to_unary(func)
-        if self:
-            res = func(self._value)
-            ensure(not isinstance(res, Opt), lambda: 'map: result Opt not expected', stack_level=2)
-            return Opt(res)
-        else:
-            return Opt.none()
+        if self._value is None:
+            return _none
+        res = to_unary(func)(self._value)
+        if isinstance(res, Opt):
+            ensure(False, lambda: 'map: result Opt not expected', stack_level=2)
+        return Opt(res)
 
     def flat_map(self, func):
-        func = to_unary(func)
-        if self:
-            return Opt(func(self._value))
-        else:
-            return Opt.none()
+        if self._value is None:
+            return _none
+        return Opt(to_unary(func)(self._value))
 
     def getattr(self, *names):
-        res = self
-        for name in names:
-            res = res.flat_map(lambda v: Opt.eval(lambda: getattr(v, name)))
-        return res
+        # a single try block for the whole chain; a missing attribute or a None on the way gives none
+        value = self._value
+        try:
+            for name in names:
+                if value is None:
+                    break
+                value = getattr(value, name)
+        except Exception:
+            return _none
+        return Opt(value)
 
     def getitem(self, *names):
-        res = self
-        for name in names:
-            res = res.flat_map(lambda v: Opt.eval(lambda: v[name]))
-        return res
+        value = self._value
+        try:
+            for name in names:
+                if value is None:
+                    break
+                value = value[name]
+        except Exception:
+            return _none
+        return Opt(value)
 
     def matches(self, pred):
         pred = to_unary(pred)
@@ -107,11 +130,10 @@ class Opt:
         return self.matches(lambda v: v == value)
 
     def filter(self, pred):
-        pred = to_unary(pred)
-        if self.matches(pred):
+        if self._value is not None and to_unary(pred)(self._value):
             return self
         else:
-            return Opt.none()
+            return _none
 
     def take_if(self, pred):
         return self.filter(pred)
@@ -139,3 +161,7 @@ class Opt:
             return self._value == other._value
         else:
             return self._value == other
+
+
+_none = object.__new__(Opt)
+_none._value = None
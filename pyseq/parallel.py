@@ -0,0 +1,88 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from pyseq.core import ensure
+from pyseq.functions import to_unary
+
+_EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def map_chunk(func, chunk):
+    func = to_unary(func)
+    return [func(item) for item in chunk]
+
+
+def filter_chunk(pred, chunk):
+    pred = to_unary(pred)
+    return [item for item in chunk if pred(item)]
+
+
+def _chunks(iterable, chunk_size):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _create_executor(executor, max_workers):
+    if isinstance(executor, Executor):
+        return executor, False
+    return _EXECUTORS[executor](max_workers=max_workers), True
+
+
+def _run(chunks, chunk_func, func, pool, owned, ordered, max_pending):
+    pending = deque() if ordered else set()
+
+    def submit_next():
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        future = pool.submit(chunk_func, func, chunk)
+        if ordered:
+            pending.append(future)
+        else:
+            pending.add(future)
+        return True
+
+    try:
+        while len(pending) < max_pending and submit_next():
+            pass
+
+        while pending:
+            if ordered:
+                done = (pending.popleft(),)
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+
+            for future in done:
+                submit_next()
+                yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True)
+
+
+def run_parallel(iterable, chunk_func, func, executor='thread', max_workers=None, ordered=True, chunk_size=1,
+                 max_pending=None):
+    ensure(chunk_size > 0, 'chunk_size: positive value expected', error_type=ValueError, stack_level=4)
+    ensure(isinstance(executor, Executor) or executor in _EXECUTORS,
+           lambda: f'unknown executor {executor!r}, expected one of {list(_EXECUTORS)}',
+           error_type=ValueError, stack_level=4)
+    max_pending = max_pending or 2 * (max_workers or os.cpu_count() or 1)
+
+    def generate():
+        # the pool is only started once the first item is requested
+        pool, owned = _create_executor(executor, max_workers)
+        yield from _run(_chunks(iterable, chunk_size), chunk_func, func, pool, owned, ordered, max_pending)
+
+    return generate()
@@ -1,8 +1,83 @@
 import functools
 import inspect
+import sys
+import weakref
+from collections import namedtuple
 
 from pyseq.core import ensure
 
+ALWAYS = 'always'
+SAMPLED = 'sampled'
+OFF = 'off'
+
+CheckingPolicy = namedtuple('CheckingPolicy', 'mode sample_every')
+
+_policy = CheckingPolicy(ALWAYS, 1)
+
+
+def set_checking_policy(mode, sample_every=100):
+    # decorators read the policy when they are applied, value_of(...).ensure on every call
+    global _policy
+    ensure(mode in (ALWAYS, SAMPLED, OFF), lambda: f'unknown checking mode {mode!r}', error_type=ValueError,
+           stack_level=2)
+    ensure(sample_every > 0, 'sample_every: positive value expected', error_type=ValueError, stack_level=2)
+    previous = _policy
+    _policy = CheckingPolicy(mode, sample_every if mode == SAMPLED else 1)
+    return previous
+
+
+def get_checking_policy():
+    return _policy
+
+
+CheckCounts = namedtuple('CheckCounts', 'checked skipped violations')
+
+
+class CheckStats:
+    def __init__(self, name):
+        self.name = name
+        self.checked = 0
+        self.skipped = 0
+        self.violations = 0
+        self.countdown = 0
+
+    def reset(self):
+        self.checked = self.skipped = self.violations = self.countdown = 0
+
+    def __repr__(self):
+        return f'CheckStats({self.name!r}, checked={self.checked}, skipped={self.skipped}, ' \
+               f'violations={self.violations})'
+
+
+_all_stats = weakref.WeakSet()
+# code object -> {line: CheckStats}, released together with dynamically created code
+_caller_stats = weakref.WeakKeyDictionary()
+
+
+def _register_stats(name):
+    stats = CheckStats(name)
+    _all_stats.add(stats)
+    return stats
+
+
+def check_stats():
+    # functions sharing a name are reported together, e.g. a decorated function defined in a loop
+    result = {}
+    for stats in list(_all_stats):
+        checked, skipped, violations = result.get(stats.name, (0, 0, 0))
+        result[stats.name] = CheckCounts(checked + stats.checked, skipped + stats.skipped,
+                                         violations + stats.violations)
+    return result
+
+
+def reset_check_stats():
+    for stats in list(_all_stats):
+        stats.reset()
+
+
+def _qualified_name(module, name):
+    return f'{module}.{name}' if module else name
+
 
 def _extract_predicates(annotation):
     if annotation is inspect.Parameter.empty:
@@ -52,21 +127,55 @@ class _Var:
         name = self.name() if callable(self.name) else self.name
         return f'{name}: expected = {self._expected(pred)}; actual = {self._actual()}'
 
+    def _raise(self, pred, stack_level):
+        ensure(False, lambda: self._format_error(pred), self.exception_type, stack_level=stack_level)
+
     def ensure(self, *predicates):
-        for pred in predicates:
-            ensure(self._test_predicate(pred),
-                   lambda: self._format_error(pred),
-                   self.exception_type,
-                   stack_level=self.stack_level)
+        policy = _policy
+        if policy.mode == OFF:
+            return self.value
+        if policy.mode == ALWAYS:
+            # without sampling there is no bookkeeping per call site, so these checks are not counted
+            for pred in predicates:
+                if not self._test_predicate(pred):
+                    self._raise(pred, self.stack_level + 1)
+            return self.value
+
+        # sampled per call site, so that every check in a function gets its turn; reported per calling function
+        frame = sys._getframe(self.stack_level - 1)
+        code = frame.f_code
+        sites = _caller_stats.get(code)
+        if sites is None:
+            sites = _caller_stats[code] = {}
+        stats = sites.get(frame.f_lineno)
+        if stats is None:
+            stats = sites[frame.f_lineno] = _register_stats(
+                _qualified_name(frame.f_globals.get('__name__'), getattr(code, 'co_qualname', code.co_name)))
+
+        if stats.countdown:
+            stats.countdown -= 1
+            stats.skipped += 1
+            return self.value
+        stats.countdown = policy.sample_every - 1
+        stats.checked += 1
 
+        for pred in predicates:
+            if not self._test_predicate(pred):
+                stats.violations += 1
+                self._raise(pred, self.stack_level + 1)
         return self.value
 
 
+def _is_type(pred):
+    return isinstance(pred, type) or (isinstance(pred, tuple) and all(map(_is_type, pred)))
+
+
 class _Wrapper:
     def __init__(self, func, preconditions=None, postconditions=None):
         self._preconditions = preconditions or {}
         self._postconditions = postconditions or []
 
+        func = getattr(func, '_pyseq_wrapper', func)
         if isinstance(func, _Wrapper):
             self._func = func._func
             self._signature = func._signature
@@ -80,8 +189,6 @@ class _Wrapper:
                 self._add_precondition(param.name, _extract_predicates(param.annotation))
             self._add_postcondition(_extract_predicates(self._signature.return_annotation))
 
-        functools.update_wrapper(self, self._func)
-
     def _add_precondition(self, name, predicates):
         if predicates:
             self._preconditions.setdefault(name, []).extend(predicates)
@@ -96,42 +203,111 @@ class _Wrapper:
         bounds_args = self._signature.bind(*args, **kwargs)
         return dict(bounds_args.arguments)
 
-    def __call__(self, *args, **kwargs):
-        bound_params = self.bind_params(*args, **kwargs)
-
-        for name, predicates in self._preconditions.items():
-            if name in bound_params:  # if missing, default argument value was used and should not be checked
-                var(bound_params[name],
-                    lambda: f'{self.format_func()}: argument "{name}"',
-                    exception_type=PreconditionError,
-                    stack_level=3).ensure(*predicates)
-
-        return_value = self._func(*args, **kwargs)
-
-        var(return_value,
-            lambda: f'{self.format_func()}: return_value',
-            exception_type=PostconditionError,
-            stack_level=3).ensure(*self._postconditions)
-
-        return return_value
+    def _fail(self, stats, name, value, pred):
+        # only called once a check has failed, raises the same error as var(...).ensure(pred) would
+        stats.violations += 1
+        if name is None:
+            var(value, lambda: f'{self.format_func()}: return_value', PostconditionError)._raise(pred, 4)
+        else:
+            var(value, lambda: f'{self.format_func()}: argument "{name}"', PreconditionError)._raise(pred, 4)
+
+    def compile(self):
+        # generates a function with the parameters of the wrapped one, so that the interpreter binds the arguments
+        # instead of Signature.bind; the checks are unrolled, type predicates becoming plain isinstance calls
+        policy = _policy
+        if policy.mode == OFF:
+            return self._func
+
+        stats = _register_stats(_qualified_name(self._func.__module__, self._func.__qualname__))
+        namespace = {'_pyseq_func': self._func, '_pyseq_fail': self._fail, '_pyseq_stats': stats}
+        params, call_args, defaults, lines = [], [], [], []
+
+        def constant(value):
+            name = f'_pyseq_c{len(namespace)}'
+            namespace[name] = value
+            return name
+
+        def checks(name, expr, keyword='if', guard=''):
+            predicates = self._postconditions if name is None else self._preconditions.get(name, ())
+            for pred in predicates:
+                test = f'isinstance({expr}, {constant(pred)})' if _is_type(pred) else f'{constant(pred)}({expr})'
+                fail = f'_pyseq_fail(_pyseq_stats, {constant(name)}, {expr}, {constant(pred)})'
+                yield f'{keyword} {guard}not {test}: {fail}'
+
+        kind = inspect.Parameter
+        parameters = list(self._signature.parameters.values())
+        for index, param in enumerate(parameters):
+            name = param.name
+            if param.kind in (kind.VAR_POSITIONAL, kind.VAR_KEYWORD):
+                prefix = '*' if param.kind == kind.VAR_POSITIONAL else '**'
+                params.append(prefix + name)
+                call_args.append(prefix + name)
+                # like a default value, nothing passed is not checked
+                lines.extend(checks(name, name, guard=f'{name} and '))
+                continue
+
+            previous = parameters[index - 1].kind if index else None
+            if param.kind == kind.KEYWORD_ONLY and previous not in (kind.KEYWORD_ONLY, kind.VAR_POSITIONAL):
+                params.append('*')
+
+            if param.default is param.empty:
+                params.append(name)
+                lines.extend(checks(name, name))
+            else:
+                # a default value is not checked, an argument that was not passed is recognised by a marker instead
+                marker = constant(object())
+                params.append(f'{name}={marker}')
+                defaults.append(f'if {name} is {marker}: {name} = {constant(param.default)}')
+                lines.append(defaults[-1])
+                lines.extend(checks(name, name, keyword='elif'))
+
+            following = parameters[index + 1].kind if index + 1 < len(parameters) else None
+            if param.kind == kind.POSITIONAL_ONLY and following != kind.POSITIONAL_ONLY:
+                params.append('/')
+            call_args.append(f'{name}={name}' if param.kind == kind.KEYWORD_ONLY else name)
+
+        call = f'_pyseq_func({", ".join(call_args)})'
+        lines.append(f'_pyseq_result = {call}')
+        lines.extend(checks(None, '_pyseq_result'))
+        lines.append('return _pyseq_result')
+
+        sampling = []
+        if policy.sample_every > 1:
+            sampling.append('if _pyseq_stats.countdown:')
+            sampling.extend(f'    {line}' for line in [
+                '_pyseq_stats.countdown -= 1',
+                '_pyseq_stats.skipped += 1',
+                *defaults,
+                f'return {call}'])
+            sampling.append(f'_pyseq_stats.countdown = {policy.sample_every - 1}')
+        lines = [*sampling, '_pyseq_stats.checked += 1', *lines]
+
+        exec(f'def checked({", ".join(params)}):\n' + ''.join(f'    {line}\n' for line in lines), namespace)
+        checked = functools.update_wrapper(namespace['checked'], self._func)
+        checked._pyseq_wrapper = self
+        checked.check_stats = stats
+        return checked
 
 
 def precondition(arg_name, *predicates):
     def decorator(func):
-        return _Wrapper(func, preconditions={arg_name: list(predicates)})
+        return _Wrapper(func, preconditions={arg_name: list(predicates)}).compile()
 
     return decorator
 
 
 def postcondition(*predicates):
     def decorator(func):
-        return _Wrapper(func, postconditions=list(predicates))
+        return _Wrapper(func, postconditions=list(predicates)).compile()
 
     return decorator
 
 
+def check_annotation(func):
+    return _Wrapper(func).compile()
+
+
 var = _Var
 value_of = var
 pre = precondition
 post = postcondition
-check_annotation = _Wrapper
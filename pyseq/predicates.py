@@ -1,32 +1,46 @@
 import re
+import time
 from decimal import Decimal
 from functools import wraps
 from math import isclose
 
-from pyseq.functions import getter
+from pyseq.functions import getter, getter_key
+from pyseq.search import AhoCorasick, contains_sub
+
+# below this many needles, one 'in' test per needle (running in C) beats a pure Python automaton
+AHO_CORASICK_MIN_NEEDLES = 128
 
 
 def _fmt(values):
     return ';'.join(map(str, values))
 
 
-def as_predicate(message):
+def as_predicate(message, spec=None):
     import inspect
 
     def wrapper(func):
-        @wraps(func)
-        def func_wrapper(*args, **kwargs):
-            if isinstance(func, inspect.Signature):
-                signature = func
-            else:
-                signature = inspect.signature(func)
+        # the signature is analysed once per factory; binding and formatting only happen when the name is read
+        signature = func if isinstance(func, inspect.Signature) else inspect.signature(func)
+        param_count = len(signature.parameters)
 
+        def arg_values(args, kwargs):
             bound_args = signature.bind(*args, **kwargs)
             bound_args.apply_defaults()
-            arg_values = dict(bound_args.arguments)
+            return dict(bound_args.arguments)
 
-            return Predicate(pred=func(*args, **kwargs),
-                             name=message.format(**arg_values))
+        @wraps(func)
+        def func_wrapper(*args, **kwargs):
+            pred = func(*args, **kwargs)
+            if not spec:
+                pred_spec = None
+            elif not kwargs and len(args) == param_count:
+                pred_spec = (spec,) + args
+            else:
+                pred_spec = (spec,) + tuple(arg_values(args, kwargs).values())
+
+            return Predicate(pred=pred,
+                             name=lambda: message.format(**arg_values(args, kwargs)),
+                             spec=pred_spec)
 
         return func_wrapper
 
@@ -34,71 +48,186 @@ def as_predicate(message):
 
 
 class Predicate:
-    def __init__(self, pred, name=None):
+    def __init__(self, pred, name=None, spec=None):
+        # spec describes well-known predicates, e.g. ('lt', 5), so that they can be evaluated in bulk
+        self._spec = spec
+        # name is either a string or a function creating it on first access to __name__
         if isinstance(pred, Predicate):
             self._pred = pred._pred
-            self.__name__ = name or pred.__name__
+            self._spec = spec or pred._spec
+            self._name = name or pred._name
         else:
             if callable(pred):
                 self._pred = pred
-                self.__name__ = name or str(self._pred)
+                self._name = name or (lambda: str(pred))
             elif isinstance(pred, type):
                 self._pred = lambda arg: isinstance(arg, pred)
-                self.__name__ = f'of type {pred.__name__}'
+                self._spec = ('of_type', pred)
+                self._name = lambda: f'of type {pred.__name__}'
             elif isinstance(pred, tuple) and all(isinstance(p, type) for p in pred):
                 self._pred = lambda arg: isinstance(arg, pred)
-                self.__name__ = f'of type ' + ','.join(p.__name__ for p in pred)
+                self._spec = ('of_type', pred)
+                self._name = lambda: f'of type ' + ','.join(p.__name__ for p in pred)
             else:
                 self._pred = lambda arg: arg == pred
-                self.__name__ = f'equal to {pred}'
+                self._spec = ('eq', pred)
+                self._name = lambda: f'equal to {pred}'
+
+    @property
+    def __name__(self):
+        if not isinstance(self._name, str):
+            self._name = self._name()
+        return self._name
 
     def __call__(self, arg):
         return self._pred(arg)
 
-    @as_predicate('({self}) and ({other})')
+    @as_predicate('({self}) and ({other})', spec='and')
     def __and__(self, other):
         return lambda arg: self(arg) and other(arg)
 
-    @as_predicate('({self}) or ({other})')
+    @as_predicate('({self}) or ({other})', spec='or')
     def __or__(self, other):
         return lambda arg: self(arg) or other(arg)
 
-    @as_predicate('({self}) xor ({other})')
+    @as_predicate('({self}) xor ({other})', spec='xor')
     def __xor__(self, other):
         return lambda arg: self(arg) ^ other(arg)
 
-    @as_predicate('not ({self})')
+    @as_predicate('not ({self})', spec='not')
     def __invert__(self):
         return lambda arg: not self(arg)
 
     @staticmethod
-    def all(*preds):
+    def all(*preds, adaptive=False, window=256, sample_every=8):
         if len(preds) == 1:
             return preds[0]
+        elif adaptive:
+            return AdaptivePredicate(preds, 'all', window=window, sample_every=sample_every)
         else:
-            return Predicate(lambda arg: all(p(arg) for p in preds), f'all [{_fmt(preds)}]')
+            return Predicate(lambda arg: all(p(arg) for p in preds), lambda: f'all [{_fmt(preds)}]', ('all', preds))
 
     @staticmethod
-    def any(*preds):
+    def any(*preds, adaptive=False, window=256, sample_every=8):
         if len(preds) == 1:
             return preds[0]
+        elif adaptive:
+            return AdaptivePredicate(preds, 'any', window=window, sample_every=sample_every)
         else:
-            return Predicate(lambda arg: any(p(arg) for p in preds), f'any [{_fmt(preds)}]')
+            return Predicate(lambda arg: any(p(arg) for p in preds), lambda: f'any [{_fmt(preds)}]', ('any', preds))
 
     @staticmethod
     def none(*preds):
         if len(preds) == 1:
             return ~preds[0]
         else:
-            return Predicate(lambda arg: not any(p(arg) for p in preds), f'none [{_fmt(preds)}]')
+            return Predicate(lambda arg: not any(p(arg) for p in preds), lambda: f'none [{_fmt(preds)}]',
+                             ('none', preds))
 
     def alias(self, name):
-        return Predicate(self._pred, name)
+        return Predicate(self._pred, name, self._spec)
+
+    def compile(self):
+        return Predicate(_compile(self), self._name, self._spec)
 
     def __repr__(self):
         return self.__name__
 
 
+class _ClauseStats:
+    def __init__(self, preds, kind, window, sample_every):
+        self.preds = tuple(preds)
+        self.order = self.preds
+        self._kind = kind
+        self._window = window
+        self._sample_every = sample_every
+        self._calls = 0
+        self._adapting = bool(self.preds)
+        self._indices = list(range(len(self.preds)))
+        self._reset()
+
+    def _reset(self):
+        self._samples = 0
+        self._elapsed = [0.0] * len(self.preds)
+        self._runs = [0] * len(self.preds)
+        self._passed = [0] * len(self.preds)
+
+    def _rank(self, index):
+        # expected cost of evaluating the clause per call it decides: cheap clauses that often
+        # short-circuit the evaluation (fail for all, pass for any) go first; clauses that did not run keep their place
+        # behind the others
+        runs = self._runs[index]
+        if not runs:
+            return float('inf')
+        cost = self._elapsed[index] / runs
+        passed = self._passed[index] / runs
+        decisive = 1.0 - passed if self._kind == 'all' else passed
+        return cost / decisive if decisive else float('inf')
+
+    def _evaluate(self, preds, arg):
+        if self._kind == 'all':
+            return all(p(arg) for p in preds)
+        else:
+            return any(p(arg) for p in preds)
+
+    def _sample(self, arg):
+        # clauses are timed until one of them decides the result, as in a normal evaluation; each sample starts
+        # from another clause, so that clauses behind a decisive one get measured as well
+        start_at = self._samples % len(self._indices)
+        result = self._kind != 'all'
+        for index in self._indices[start_at:] + self._indices[:start_at]:
+            start = time.perf_counter()
+            passed = self.preds[index](arg)
+            self._elapsed[index] += time.perf_counter() - start
+            self._runs[index] += 1
+            if passed:
+                self._passed[index] += 1
+            if bool(passed) == result:
+                break
+        else:
+            result = not result
+
+        self._samples += 1
+        if self._samples >= self._window:
+            self._indices = sorted(range(len(self.preds)), key=self._rank)
+            self.order = tuple(self.preds[i] for i in self._indices)
+            self._reset()
+
+        return result
+
+    def __call__(self, arg):
+        if not self._adapting:
+            return self._evaluate(self.preds, arg)
+        self._calls += 1
+        try:
+            if self._calls % self._sample_every == 0:
+                return self._sample(arg)
+            return self._evaluate(self.order, arg)
+        except Exception:
+            # a clause raised, possibly because it ran before the one guarding it (x > 3 before not_none):
+            # the order matters for these clauses, so the declared one is used from now on
+            self._adapting = False
+            self.order = self.preds
+            return self._evaluate(self.preds, arg)
+
+
+class AdaptivePredicate(Predicate):
+    def __init__(self, preds, kind, window=256, sample_every=8):
+        self._stats = _ClauseStats(preds, kind, window, sample_every)
+        super().__init__(self._stats, lambda: f'{kind} [{_fmt(preds)}]', (kind, tuple(preds)))
+
+    @property
+    def order(self):
+        return self._stats.order
+
+    def freeze(self):
+        order = self.order
+        if self._stats._kind == 'all':
+            return Predicate.all(*order).alias(self._name)
+        else:
+            return Predicate.any(*order).alias(self._name)
+
+
 always = Predicate(lambda _arg: True, 'always')
 never = always.alias('never')
 
@@ -107,32 +236,32 @@ def of_type(*types):
     return Predicate(types)
 
 
-@as_predicate('equal to {value}')
+@as_predicate('equal to {value}', spec='eq')
 def eq(value):
     return lambda arg: arg == value
 
 
-@as_predicate('not equal to {value}')
+@as_predicate('not equal to {value}', spec='ne')
 def ne(value):
     return lambda arg: arg != value
 
 
-@as_predicate('less than {value}')
+@as_predicate('less than {value}', spec='lt')
 def lt(value):
     return lambda arg: arg < value
 
 
-@as_predicate('less than or equal to {value}')
+@as_predicate('less than or equal to {value}', spec='le')
 def le(value):
     return lambda arg: arg <= value
 
 
-@as_predicate('greater than {value}')
+@as_predicate('greater than {value}', spec='gt')
 def gt(value):
     return lambda arg: arg > value
 
 
-@as_predicate('greater than or equal to {value}')
+@as_predicate('greater than or equal to {value}', spec='ge')
 def ge(value):
     return lambda arg: arg >= value
 
@@ -161,12 +290,12 @@ def approx_equal(value, rel_tol=None, abs_tol=None):
     return lambda arg: isclose(arg, value, **kwargs)
 
 
-@as_predicate('between {lo} and {up}')
+@as_predicate('between {lo} and {up}', spec='between')
 def between(lo, up):
     return lambda arg: lo <= arg <= up
 
 
-@as_predicate('divisible by {d}')
+@as_predicate('divisible by {d}', spec='divisible_by')
 def divisible_by(d):
     return lambda arg: arg % d == 0
 
@@ -176,7 +305,7 @@ odd = (~even).alias('odd')
 
 
 def any_of(*args):
-    return Predicate(lambda arg: arg in args, f'any of {_fmt(args)}')
+    return Predicate(lambda arg: arg in args, lambda: f'any of {_fmt(args)}', ('any_of', args))
 
 
 none = Predicate(lambda arg: arg is None, 'none')
@@ -186,7 +315,9 @@ not_none = (~none).alias('not none')
 def match(get, pred):
     get = getter(get)
     pred = Predicate(pred)
-    return Predicate(pred=lambda arg: pred(get(arg)), name=f'{get.__name__}:{pred}')
+    get_value, test = get._func, pred._pred
+    return Predicate(pred=lambda arg: test(get_value(arg)), name=lambda: f'{get.__name__}:{pred}',
+                     spec=('match', get, pred))
 
 
 def matches(dct):
@@ -218,34 +349,166 @@ def has_suffix(suffix):
 
 @as_predicate('has sub {sub}')
 def has_sub(sub):
-    return lambda arg: any(arg[i:i + len(sub)] == sub for i in range(len(arg)))
+    return lambda arg: contains_sub(arg, sub)
 
 
 def matches_re(pattern):
     r = re.compile(pattern)
-    return Predicate(lambda arg: r.match(arg), f'matches regex {pattern}')
+    return Predicate(lambda arg: r.match(arg), lambda: f'matches regex {pattern}')
 
 
-@as_predicate('contains {value}')
+@as_predicate('contains {value}', spec='contains')
 def contains(value):
     return lambda arg: value in arg
 
 
-@as_predicate('inside {value}')
+@as_predicate('inside {value}', spec='inside')
 def inside(value):
     return lambda arg: arg in value
 
 
+class _MultiSearch:
+    # one pass of an Aho-Corasick automaton over str/bytes items instead of one 'in' test per needle
+    def __init__(self, values, mode, fallback):
+        self._values = values
+        self._mode = mode
+        self._fallback = fallback
+        self._text_type = next(t for t in (str, bytes) if isinstance(values[0], t))
+        self._automaton = None
+
+    def __call__(self, arg):
+        if not isinstance(arg, self._text_type):
+            return self._fallback(arg)
+        if self._automaton is None:
+            self._automaton = AhoCorasick(self._values)
+        if self._mode == 'all':
+            return self._automaton.all(arg)
+        found = self._automaton.any(arg)
+        return not found if self._mode == 'none' else found
+
+
+def _contains_many(values, mode, pred, name):
+    if len(values) >= AHO_CORASICK_MIN_NEEDLES and any(all(isinstance(v, t) for v in values) for t in (str, bytes)):
+        return Predicate(_MultiSearch(values, mode, pred), name, pred._spec)
+    return pred.alias(name)
+
+
 def contains_all_of(*values):
-    return Predicate.all(*(contains(v) for v in values)).alias(f'contains all of {_fmt(values)}')
+    return _contains_many(values, 'all', Predicate.all(*(contains(v) for v in values)),
+                          lambda: f'contains all of {_fmt(values)}')
 
 
 def contains_any_of(*values):
-    return Predicate.any(*(contains(v) for v in values)).alias(f'contains any of {_fmt(values)}')
+    return _contains_many(values, 'any', Predicate.any(*(contains(v) for v in values)),
+                          lambda: f'contains any of {_fmt(values)}')
 
 
 def contains_none_of(*values):
-    return Predicate.none(*(contains(v) for v in values)).alias(f'contains none of {_fmt(values)}')
+    return _contains_many(values, 'none', Predicate.none(*(contains(v) for v in values)),
+                          lambda: f'contains none of {_fmt(values)}')
+
+
+_TEMPLATES = {
+    'eq': '({v} == {c[0]})',
+    'ne': '({v} != {c[0]})',
+    'lt': '({v} < {c[0]})',
+    'le': '({v} <= {c[0]})',
+    'gt': '({v} > {c[0]})',
+    'ge': '({v} >= {c[0]})',
+    'between': '({c[0]} <= {v} <= {c[1]})',
+    'divisible_by': '({v} % {c[0]} == 0)',
+    'any_of': '({v} in {c[0]})',
+    'inside': '({v} in {c[0]})',
+    'contains': '({c[0]} in {v})',
+    'of_type': 'isinstance({v}, {c[0]})',
+}
+
+
+_unset = object()
+
+
+class _Compiler:
+    def __init__(self, share_getters=False):
+        self.constants = {}
+        # a getter in match fills a variable where it is first evaluated, so that it runs once even if its value is
+        # tested many times; with shared getters every distinct (input, getter path) pair maps to one variable
+        self.variables = []
+        self.shared = {} if share_getters else None
+
+    def constant(self, value):
+        name = f'c{len(self.constants)}'
+        self.constants[name] = value
+        return name
+
+    def emit(self, pred, v):
+        spec = getattr(pred, '_spec', None)
+        if spec is None:
+            func = pred._pred if isinstance(pred, Predicate) else pred
+            return f'{self.constant(func)}({v})'
+
+        kind, args = spec[0], spec[1:]
+        if kind in _TEMPLATES:
+            return _TEMPLATES[kind].format(v=v, c=[self.constant(a) for a in args])
+        if kind == 'and':
+            return f'({self.emit(args[0], v)} and {self.emit(args[1], v)})'
+        if kind == 'or':
+            return f'({self.emit(args[0], v)} or {self.emit(args[1], v)})'
+        if kind == 'xor':
+            return f'({self.emit(args[0], v)} ^ {self.emit(args[1], v)})'
+        if kind == 'not':
+            return f'(not {self.emit(args[0], v)})'
+        # without clauses, all and none are true and any is false, as with the builtins
+        if kind == 'all':
+            return '(True if ({}) else False)'.format(' and '.join(self.emit(p, v) for p in args[0]) or 'True')
+        if kind == 'any':
+            return '(True if ({}) else False)'.format(' or '.join(self.emit(p, v) for p in args[0]) or 'False')
+        if kind == 'none':
+            return '(not ({}))'.format(' or '.join(self.emit(p, v) for p in args[0]) or 'False')
+        if kind == 'match':
+            if self.shared is not None:
+                return self.emit(args[1], self._shared_var(args[0], v))
+            return self.emit(args[1], self._var(args[0], v))
+        return f'{self.constant(pred._pred)}({v})'
+
+    def _var(self, get, v):
+        # the first use in the text is not always evaluated first, e.g. after 'False and', so every use is guarded
+        name = f'v{len(self.variables) + 1}'
+        self.variables.append(name)
+        return f'({name} if {name} is not _unset else ({name} := {self.constant(get._func)}({v})))'
+
+    def _shared_var(self, get, v):
+        key = (v, getter_key(get))
+        if key not in self.shared:
+            self.shared[key] = self._var(get, v)
+        return self.shared[key]
+
+    def compile(self, header, lines):
+        if self.variables:
+            lines = [f'{" = ".join(self.variables)} = _unset', *lines]
+        namespace = dict(self.constants, _unset=_unset)
+        exec(header + ''.join(f'    {line}\n' for line in lines), namespace)
+        return namespace
+
+
+def _compile(pred):
+    compiler = _Compiler()
+    body = compiler.emit(pred, 'arg')
+    return compiler.compile('def compiled(arg):\n', [f'return {body}'])['compiled']
+
+
+def compile_first_match(indexed_preds):
+    # returns find(arg, limit): the index of the first predicate (in the given order) that holds for arg,
+    # or limit if none of the predicates with a smaller index does; values extracted by getters in match/matches
+    # are shared between all predicates
+    compiler = _Compiler(share_getters=True)
+    lines = []
+    for index, pred in indexed_preds:
+        lines.append(f'if limit <= {index}:')
+        lines.append(f'    return limit')
+        lines.append(f'if {compiler.emit(pred, "arg")}:')
+        lines.append(f'    return {index}')
+    lines.append('return limit')
+    return compiler.compile('def find(arg, limit):\n', lines)['find']
 
 
 class Iterable(Predicate):
@@ -253,7 +516,7 @@ class Iterable(Predicate):
         super().__init__(lambda arg: hasattr(arg, '__iter__'), 'iterable')
 
     def __getitem__(self, item):
-        return Predicate(self, f'iterable[{item}]')
+        return Predicate(self, lambda: f'iterable[{item}]')
 
 
 class Collection(Predicate):
@@ -261,7 +524,7 @@ class Collection(Predicate):
         super().__init__(lambda arg: hasattr(arg, '__iter__') and hasattr(arg, '__len__'), 'collection')
 
     def __getitem__(self, item):
-        return Predicate(self, f'collection[{item}]')
+        return Predicate(self, lambda: f'collection[{item}]')
 
 
 iterable = Iterable()
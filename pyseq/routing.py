@@ -0,0 +1,78 @@
+from collections import deque
+
+from pyseq.core import ensure
+
+_missing = object()
+
+
+class Router:
+    def __init__(self, iterable, key, keys, max_buffer=None):
+        self._it = iter(iterable)
+        self._key = key
+        self._buffers = {k: deque() for k in keys}
+        self._max_buffer = max_buffer
+
+    def _route(self, item):
+        buf = self._buffers.get(self._key(item))
+        if buf is None:  # unknown key or the branch was closed
+            return
+        ensure(self._max_buffer is None or len(buf) < self._max_buffer,
+               lambda: f'more than {self._max_buffer} items buffered for a branch that is not being consumed',
+               error_type=BufferError)
+        buf.append(item)
+
+    def _next(self, k):
+        buf = self._buffers[k]
+        while not buf:
+            item = next(self._it, _missing)
+            if item is _missing:
+                raise StopIteration
+            # the key is computed once, here; items for other branches wait in their buffers
+            self._route(item)
+        return buf.popleft()
+
+    def _close(self, k):
+        self._buffers[k] = None
+
+    def branch(self, k):
+        return _Branch(self, k)
+
+    def branches(self):
+        return tuple(self.branch(k) for k in self._buffers)
+
+
+class _Branch:
+    # a plain iterator rather than a generator: it stops the buffering for its key once it is closed, exhausted or
+    # garbage collected, including when it is dropped before being started
+    def __init__(self, router, key):
+        self._router = router
+        self._key = key
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._router is None:
+            raise StopIteration
+        try:
+            return self._router._next(self._key)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self):
+        if self._router is not None:
+            self._router._close(self._key)
+            self._router = None
+
+    def __del__(self):
+        self.close()
+
+
+def split_eagerly(iterable, key, keys):
+    lists = {k: [] for k in keys}
+    for item in iterable:
+        lst = lists.get(key(item))
+        if lst is not None:
+            lst.append(item)
+    return tuple(lists.values())
@@ -0,0 +1,96 @@
+from collections import deque
+
+
+def contains_sub(seq, sub):
+    # same result as testing seq[i:i + len(sub)] == sub at every offset i of seq
+    n = len(sub)
+    if n == 0:
+        return len(seq) > 0
+    if isinstance(seq, str) and isinstance(sub, str):
+        return sub in seq
+    if isinstance(seq, (bytes, bytearray)) and isinstance(sub, (bytes, bytearray)):
+        return sub in seq
+
+    last = len(seq) - n
+    if not isinstance(seq, (list, tuple)):
+        # e.g. str.index rejects non-str elements and range.index takes no bounds
+        return any(seq[i:i + n] == sub for i in range(last + 1))
+
+    first = sub[0]
+    i = 0
+    while i <= last:
+        # only offsets holding the first element are compared, and the scan for them runs in C
+        try:
+            i = seq.index(first, i, last + 1)
+        except ValueError:
+            return False
+        if seq[i:i + n] == sub:
+            return True
+        i += 1
+    return False
+
+
+class AhoCorasick:
+    def __init__(self, needles):
+        self.needles = tuple(needles)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._always = frozenset(i for i, needle in enumerate(self.needles) if not needle)
+
+        for index, needle in enumerate(self.needles):
+            if needle:
+                self._insert(index, needle)
+        self._link()
+
+    def _insert(self, index, needle):
+        state = 0
+        for ch in needle:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (index,)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def _matches(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield out[state]
+
+    def any(self, text):
+        if self._always:
+            return True
+        for _ in self._matches(text):
+            return True
+        return False
+
+    def all(self, text):
+        missing = set(range(len(self.needles))) - self._always
+        if not missing:
+            return True
+        for found in self._matches(text):
+            missing.difference_update(found)
+            if not missing:
+                return True
+        return False
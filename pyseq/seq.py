@@ -1,21 +1,43 @@
 import functools
 import itertools
 import operator
+import sys
 from collections import deque
 from functools import wraps
 
-from pyseq.functions import identity, negate, invoke_on_value, get_key, to_unary
+from pyseq import joins
+from pyseq import windows
+from pyseq.cache import CachedIterable
+from pyseq.core import ensure
+from pyseq.functions import identity, negate, invoke_on_value, get_key, to_unary, aggregate
+from pyseq.fusion import fuse
 from pyseq.opt import Opt
+from pyseq.parallel import run_parallel, map_chunk, filter_chunk
+from pyseq.routing import Router, split_eagerly
+from pyseq.sketches import BloomFilter, HyperLogLog
+from pyseq.sorting import SortedView, top_k, bottom_k
 
 
 def as_seq(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        return Seq(func(*args, **kwargs))
+        result = func(*args, **kwargs)
+        # many methods build on other methods and already return a Seq
+        return result if isinstance(result, Seq) else _wrap(result)
 
     return wrapper
 
 
+def _wrap(iterable):
+    # Seq(iterable) without the calls to __new__ and __init__
+    if _is_ndarray(iterable):
+        return Seq(iterable)
+    result = object.__new__(Seq)
+    result._source = iterable
+    result._stages = ()
+    return result
+
+
 def _adjust_selectors(key_selector, value_selector):
     if key_selector is None and value_selector is None:
         return operator.itemgetter(0), operator.itemgetter(1)
@@ -23,14 +45,55 @@ def _adjust_selectors(key_selector, value_selector):
         return to_unary(key_selector) or identity, to_unary(value_selector) or identity
 
 
+def _adjust_join_selectors(key_selector, other_key_selector):
+    key_selector = to_unary(key_selector)
+    return key_selector, to_unary(other_key_selector) if other_key_selector is not None else key_selector
+
+
+_missing = object()
+
+_opt_value = operator.attrgetter('_value')
+_is_not_none = functools.partial(operator.is_not, None)
+
+
 def _append(lst, item):
     lst.append(item)
     return lst
 
 
+def _is_ndarray(obj):
+    # numpy is not imported here: unless somebody else imported it, obj cannot be an array
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+
 class Seq:
+    __slots__ = ('_source', '_stages')
+
+    def __new__(cls, iterable=None):
+        if cls is Seq and _is_ndarray(iterable) and iterable.ndim == 1:
+            from pyseq.array_seq import ArraySeq
+            cls = ArraySeq
+        return super().__new__(cls)
+
     def __init__(self, iterable):
-        self._iterable = iterable._iterable if isinstance(iterable, Seq) else iterable
+        self._source = iterable._iterable if isinstance(iterable, Seq) else iterable
+        self._stages = ()
+
+    @property
+    def _iterable(self):
+        if self._stages:
+            self._source = fuse(self._source, self._stages)
+            self._stages = ()
+        return self._source
+
+    def _add_stage(self, kind, a, b=None):
+        # element-wise stages are only recorded here and fused into a single loop on first access to _iterable;
+        # like the builtin map/filter, the source iterator is obtained right away and shared with derived Seqs
+        result = object.__new__(Seq)
+        result._source = self._source if self._stages else iter(self._source)
+        result._stages = self._stages + ((kind, a, b),)
+        return result
 
     def __iter__(self):
         return iter(self._iterable)
@@ -38,6 +101,11 @@ class Seq:
     def len(self):
         return sum(1 for item in self._iterable)
 
+    @staticmethod
+    def from_array(array):
+        from pyseq.array_seq import ArraySeq
+        return ArraySeq(array)
+
     @staticmethod
     @as_seq
     def range(*args):
@@ -100,24 +168,27 @@ class Seq:
         except TypeError:
             return Seq.once(obj)
 
-    @as_seq
     def map(self, func):
-        func = to_unary(func)
-        return map(func, self._iterable)
+        return self._add_stage('map', to_unary(func))
 
-    @as_seq
     def filter(self, pred):
-        pred = to_unary(pred)
-        return filter(pred, self._iterable)
+        return self._add_stage('filter', to_unary(pred))
 
-    @as_seq
     def take_if(self, pred):
         return self.filter(pred)
 
-    @as_seq
     def drop_if(self, pred):
-        pred = to_unary(pred)
-        return self.filter(negate(pred))
+        return self._add_stage('drop', to_unary(pred))
+
+    @as_seq
+    def par_map(self, func, executor='thread', max_workers=None, ordered=True, chunk_size=1, max_pending=None):
+        return run_parallel(self._iterable, map_chunk, func, executor=executor, max_workers=max_workers,
+                            ordered=ordered, chunk_size=chunk_size, max_pending=max_pending)
+
+    @as_seq
+    def par_filter(self, pred, executor='thread', max_workers=None, ordered=True, chunk_size=1, max_pending=None):
+        return run_parallel(self._iterable, filter_chunk, pred, executor=executor, max_workers=max_workers,
+                            ordered=ordered, chunk_size=chunk_size, max_pending=max_pending)
 
     @as_seq
     def take_while(self, pred):
@@ -131,16 +202,17 @@ class Seq:
 
     @as_seq
     def take_until(self, pred):
-        pred = to_unary(pred)
-        return self.take_while(negate(pred))
+        return itertools.takewhile(negate(to_unary(pred)), self._iterable)
 
     @as_seq
     def drop_until(self, pred):
-        pred = to_unary(pred)
-        return self.drop_while(negate(pred))
+        return itertools.dropwhile(negate(to_unary(pred)), self._iterable)
 
     @as_seq
     def take(self, n):
+        if not self._stages and isinstance(self._source, SortedView) and isinstance(n, int) and n >= 0:
+            # sort().take(n) is a partial selection and does not need to sort everything
+            return self._source.head(n)
         return itertools.islice(self._iterable, None, n)
 
     @as_seq
@@ -151,14 +223,11 @@ class Seq:
     def slice(self, *args):
         return itertools.islice(self._iterable, *args)
 
-    @as_seq
     def replace_if(self, pred, new_value):
-        pred = to_unary(pred)
-        return self.map(lambda item: new_value if pred(item) else item)
+        return self._add_stage('replace_if', to_unary(pred), new_value)
 
-    @as_seq
     def replace(self, old_value, new_value):
-        return self.replace_if(lambda item: item == old_value, new_value)
+        return self._add_stage('replace', old_value, new_value)
 
     @as_seq
     def enumerate(self, start=0):
@@ -168,23 +237,52 @@ class Seq:
     def collect(self):
         return list(self._iterable)
 
+    def cache(self, max_size=None):
+        if not self._stages and isinstance(self._source, CachedIterable):
+            return self
+        return Seq(CachedIterable(self._iterable, max_size=max_size))
+
     @as_seq
     def reverse(self):
         return reversed(self._iterable)
 
     @as_seq
-    def sort(self, key=identity):
+    def sort(self, key=identity, run_size=None):
+        ensure(run_size is None or run_size > 0, 'sort: positive run_size expected', error_type=ValueError,
+               stack_level=3)
+        key = to_unary(key)
+        return SortedView(self._iterable, key=key, run_size=run_size)
+
+    @as_seq
+    def sort_desc(self, key=identity, run_size=None):
+        ensure(run_size is None or run_size > 0, 'sort_desc: positive run_size expected', error_type=ValueError,
+               stack_level=3)
         key = to_unary(key)
-        return sorted(self._iterable, key=key)
+        return SortedView(self._iterable, key=key, reverse=True, run_size=run_size)
 
     @as_seq
-    def sort_desc(self, key=identity):
+    def top_k(self, n, key=identity):
         key = to_unary(key)
-        return sorted(self._iterable, key=key, reverse=True)
+        return top_k(self._iterable, n, key=key)
+
+    @as_seq
+    def bottom_k(self, n, key=identity):
+        key = to_unary(key)
+        return bottom_k(self._iterable, n, key=key)
+
+    nlargest = top_k
+    nsmallest = bottom_k
 
     @as_seq
-    def unique(self, key=identity):
+    def unique(self, key=identity, approximate=False, capacity=1000000, error_rate=0.01):
         key = to_unary(key)
+        if approximate:
+            # fixed memory, but a false positive drops an item that was not seen before
+            bloom = BloomFilter(capacity, error_rate)
+            for item in self._iterable:
+                if bloom.add(key(item)):
+                    yield item
+            return
         visited = set()
         for item in self._iterable:
             k = key(item)
@@ -210,6 +308,37 @@ class Seq:
             other_iterable = set(other_iterable)
         return self.drop_if(lambda item: item in other_iterable)
 
+    @as_seq
+    def inner_join(self, other_iterable, key_selector=None, other_key_selector=None, result_selector=None):
+        # the smaller side is indexed when both have a length, and the output follows the order of the other one:
+        # of this Seq, unless other_iterable is the larger one; sort the result where the order matters
+        key_selector, other_key_selector = _adjust_join_selectors(key_selector, other_key_selector)
+        pairs = joins.hash_join(self._iterable, other_iterable, key_selector, other_key_selector)
+        return map(to_unary(result_selector), pairs) if result_selector else pairs
+
+    @as_seq
+    def left_join(self, other_iterable, key_selector=None, other_key_selector=None, result_selector=None,
+                  default=None):
+        key_selector, other_key_selector = _adjust_join_selectors(key_selector, other_key_selector)
+        pairs = joins.left_join(self._iterable, other_iterable, key_selector, other_key_selector, default)
+        return map(to_unary(result_selector), pairs) if result_selector else pairs
+
+    @as_seq
+    def merge_join(self, other_iterable, key_selector=None, other_key_selector=None, result_selector=None):
+        key_selector, other_key_selector = _adjust_join_selectors(key_selector, other_key_selector)
+        pairs = joins.merge_join(self._iterable, other_iterable, key_selector, other_key_selector)
+        return map(to_unary(result_selector), pairs) if result_selector else pairs
+
+    @as_seq
+    def semi_join(self, other_iterable, key_selector=None, other_key_selector=None):
+        key_selector, other_key_selector = _adjust_join_selectors(key_selector, other_key_selector)
+        return joins.semi_join(self._iterable, other_iterable, key_selector, other_key_selector)
+
+    @as_seq
+    def anti_join(self, other_iterable, key_selector=None, other_key_selector=None):
+        key_selector, other_key_selector = _adjust_join_selectors(key_selector, other_key_selector)
+        return joins.anti_join(self._iterable, other_iterable, key_selector, other_key_selector)
+
     @as_seq
     def zip_with(self, other_iterable):
         return Seq.zip(self._iterable, other_iterable)
@@ -234,12 +363,8 @@ class Seq:
 
     @as_seq
     def filter_map(self, func):
-        func = to_unary(func)
-        for item in self._iterable:
-            res = func(item)
-            assert isinstance(res, Opt)
-            if res.is_some():
-                yield res.get()
+        # the results are unpacked without checking each one; anything but an Opt fails on the missing _value
+        return filter(_is_not_none, map(_opt_value, map(to_unary(func), self._iterable)))
 
     def _split(self, handler):
         buf = []
@@ -274,15 +399,55 @@ class Seq:
     def tee(self, n=2):
         return tuple(Seq(it) for it in itertools.tee(self._iterable, n))
 
-    def partition(self, pred):
+    def split_by(self, key, keys, eager=False, max_buffer=None):
+        key = to_unary(key)
+        keys = tuple(keys)
+        ensure(len(set(keys)) == len(keys), lambda: f'split_by: duplicate keys in {keys!r}', error_type=ValueError,
+               stack_level=2)
+        if eager:
+            branches = split_eagerly(self._iterable, key, keys)
+        else:
+            branches = Router(self._iterable, key, keys, max_buffer=max_buffer).branches()
+        return tuple(Seq(b) for b in branches)
+
+    def partition(self, pred, eager=False, max_buffer=None):
         pred = to_unary(pred)
-        s1, s2 = self.tee()
-        return s1.take_if(pred), s2.drop_if(pred)
+        return self.split_by(lambda item: not pred(item), (False, True), eager=eager, max_buffer=max_buffer)
 
     @as_seq
     def adjacent(self):
-        s1, s2 = self.tee()
-        return Seq.zip(s1, s2.drop(1))
+        it = iter(self._iterable)
+        prev = next(it, _missing)
+        if prev is _missing:
+            return
+        for item in it:
+            yield prev, item
+            prev = item
+
+    @as_seq
+    def window(self, size, step=1):
+        ensure(size > 0 and step > 0, 'window: positive size and step expected', error_type=ValueError, stack_level=3)
+        return windows.windows(self._iterable, size, step)
+
+    @as_seq
+    def rolling_sum(self, size):
+        ensure(size > 0, 'rolling_sum: positive size expected', error_type=ValueError, stack_level=3)
+        return windows.rolling_sum(self._iterable, size)
+
+    @as_seq
+    def rolling_mean(self, size):
+        ensure(size > 0, 'rolling_mean: positive size expected', error_type=ValueError, stack_level=3)
+        return windows.rolling_mean(self._iterable, size)
+
+    @as_seq
+    def rolling_min(self, size):
+        ensure(size > 0, 'rolling_min: positive size expected', error_type=ValueError, stack_level=3)
+        return windows.rolling_min(self._iterable, size)
+
+    @as_seq
+    def rolling_max(self, size):
+        ensure(size > 0, 'rolling_max: positive size expected', error_type=ValueError, stack_level=3)
+        return windows.rolling_max(self._iterable, size)
 
     @as_seq
     def adjacent_difference(self, func=None):
@@ -305,6 +470,13 @@ class Seq:
     def contains(self, value):
         return self.any(lambda item: item == value)
 
+    def count_distinct(self, key=identity, precision=14):
+        key = to_unary(key)
+        hll = HyperLogLog(precision)
+        for item in self._iterable:
+            hll.add(key(item))
+        return hll.count()
+
     def for_each(self, func):
         func = to_unary(func)
         for item in self._iterable:
@@ -320,6 +492,10 @@ class Seq:
     def join(self, separator=''):
         return separator.join(self.map(str))
 
+    def to_async(self):
+        from pyseq.async_seq import AsyncSeq
+        return AsyncSeq(self)
+
     def to(self, container):
         return container(self._iterable)
 
@@ -353,25 +529,51 @@ class Seq:
         for key, values in groups.items():
             yield key, result_selector(Seq(values))
 
+    @as_seq
+    def group_by_adjacent(self, key_selector=None, value_selector=None, result_selector=None):
+        # like itertools.groupby: a group is only valid until the next one is requested
+        result_selector = result_selector or identity
+        key_selector, value_selector = _adjust_selectors(key_selector, value_selector)
+        for key, items in itertools.groupby(self._iterable, key_selector):
+            yield key, result_selector(Seq(items).map(value_selector))
+
+    @as_seq
+    def aggregate_by(self, key_selector=None, value_selector=None, func=operator.add):
+        key_selector, value_selector = _adjust_selectors(key_selector, value_selector)
+        agg = func if isinstance(func, aggregate) else aggregate(func)
+        step = agg.step
+        accumulators = {}
+        for item in self._iterable:
+            key = key_selector(item)
+            value = value_selector(item)
+            if key in accumulators:
+                accumulators[key] = step(accumulators[key], value)
+            else:
+                accumulators[key] = agg.start(value)
+        for key, acc in accumulators.items():
+            yield key, agg.finish(acc)
+
     def reduce(self, func, init):
         return functools.reduce(func, self._iterable, init)
 
-    def sum(self, init=0.0):
-        return self.reduce(operator.add, init)
+    def sum(self, init=0):
+        if isinstance(init, (str, bytes)):  # rejected by the builtin sum
+            return self.reduce(operator.add, init)
+        return sum(self._iterable, init)
 
     def min(self, key=identity):
         key = to_unary(key)
-        return Opt.eval(lambda: min(self._iterable, key=key))
+        return Opt.eval(lambda: min(self._iterable, key=key, default=None))
 
     def max(self, key=identity):
         key = to_unary(key)
-        return Opt.eval(lambda: max(self._iterable, key=key))
+        return Opt.eval(lambda: max(self._iterable, key=key, default=None))
 
     def first(self):
         return Opt.of(next(iter(self._iterable), None))
 
     def last(self):
-        return Opt.eval(lambda: deque(self._iterable, maxlen=1)[0])
+        return Opt.eval(lambda: next(iter(deque(self._iterable, maxlen=1)), None))
 
     def nth(self, index):
         return self.drop(index).first()
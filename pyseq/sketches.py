@@ -0,0 +1,71 @@
+import math
+
+from pyseq.core import ensure
+
+_MASK64 = (1 << 64) - 1
+
+
+def hash64(value):
+    # splitmix64 finalizer over the builtin hash; ints are taken as they are, since hash(-1) == hash(-2)
+    x = value & _MASK64 if type(value) is int else hash(value) & _MASK64
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        ensure(capacity > 0, 'capacity: positive value expected', error_type=ValueError, stack_level=2)
+        ensure(0 < error_rate < 1, 'error_rate: value in (0, 1) expected', error_type=ValueError, stack_level=2)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # double hashing: the two halves of one 64-bit hash generate all hash_count positions
+        h = hash64(value)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, value):
+        # returns False when the value was (probably) seen before
+        bits = self._bits
+        added = False
+        for pos in self._positions(value):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+        return added
+
+    def __contains__(self, value):
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        ensure(4 <= precision <= 16, 'precision: value in [4, 16] expected', error_type=ValueError, stack_level=2)
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value):
+        h = hash64(value)
+        p = self.precision
+        index = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self):
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # small range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
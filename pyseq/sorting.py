@@ -0,0 +1,134 @@
+import heapq
+import itertools
+import pickle
+import tempfile
+from operator import itemgetter
+
+from pyseq.core import ensure
+from pyseq.functions import identity
+
+_BATCH_SIZE = 1024
+
+
+def _key_arg(key):
+    return None if key is identity else key
+
+
+def bottom_k(iterable, n, key=identity):
+    # heapq.nsmallest/nlargest keep a heap of n items and break ties by position,
+    # so the result equals sorted(...)[:n], including the order of equal keys
+    return heapq.nsmallest(n, iterable, key=_key_arg(key))
+
+
+def top_k(iterable, n, key=identity):
+    return heapq.nlargest(n, iterable, key=_key_arg(key))
+
+
+def _spill(records):
+    file = tempfile.TemporaryFile()
+    it = iter(records)
+    while True:
+        batch = list(itertools.islice(it, _BATCH_SIZE))
+        if not batch:
+            break
+        pickle.dump(batch, file, protocol=pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def _load(file):
+    try:
+        while True:
+            yield from pickle.load(file)
+    except EOFError:
+        pass
+
+
+def external_sort(iterable, key=identity, reverse=False, run_size=100000):
+    ensure(run_size > 0, 'run_size: positive value expected', error_type=ValueError, stack_level=2)
+    it = iter(iterable)
+
+    def generate():
+        files = []
+        try:
+            while True:
+                run = list(itertools.islice(it, run_size))
+                if not files and len(run) < run_size:
+                    # everything fits into a single run, no need to touch the disk
+                    yield from sorted(run, key=_key_arg(key), reverse=reverse)
+                    return
+                if not run:
+                    break
+                # keys are stored next to the items, so that key is called once per item, as with sorted()
+                records = sorted(((key(item), item) for item in run), key=itemgetter(0), reverse=reverse)
+                del run
+                files.append(_spill(records))
+                del records
+
+            # heapq.merge prefers earlier runs on equal keys, which keeps the sort stable
+            merged = heapq.merge(*(_load(f) for f in files), key=itemgetter(0), reverse=reverse)
+            for _, item in merged:
+                yield item
+        finally:
+            for f in files:
+                f.close()
+
+    return generate()
+
+
+class SortedView:
+    # sorts lazily on first use, like the other Seq operations it sees changes made to a source list until then
+    def __init__(self, iterable, key=identity, reverse=False, run_size=None):
+        self._iterable = iterable
+        self._key = key
+        self._reverse = reverse
+        self._run_size = run_size
+        self._items = None
+
+    def _take_source(self):
+        ensure(self._iterable is not None,
+               'the one-shot source of this sorted Seq was already consumed by take(n)', stack_level=3)
+        iterable = self._iterable
+        if iter(iterable) is iterable:
+            self._iterable = None
+        return iterable
+
+    def _sorted(self):
+        if self._items is None:
+            self._items = sorted(self._take_source(), key=_key_arg(self._key), reverse=self._reverse)
+            self._iterable = None
+        return self._items
+
+    def __iter__(self):
+        if self._run_size is not None and self._items is None:
+            # external sort streams its result, so like other generator-based Seqs it can be iterated once
+            iterable, self._iterable, self._items = self._take_source(), None, []
+            return external_sort(iterable, key=self._key, reverse=self._reverse, run_size=self._run_size)
+        return iter(self._sorted())
+
+    def __reversed__(self):
+        if self._run_size is not None and self._items is None:
+            iterable, self._iterable, self._items = self._take_source(), None, []
+            key, reverse = self._key, not self._reverse
+
+            def reversed_key(pair):
+                # equal keys come out in reversed input order, as with reversed(sorted(...))
+                index, item = pair
+                return key(item), index if reverse else -index
+
+            return map(itemgetter(1), external_sort(enumerate(iterable), key=reversed_key, reverse=reverse,
+                                                    run_size=self._run_size))
+        return reversed(self._sorted())
+
+    def __len__(self):
+        if self._run_size is not None and self._items is None:
+            # an unsized source raises TypeError instead of being sorted in memory
+            return len(self._iterable)
+        return len(self._sorted())
+
+    def head(self, n):
+        if self._items is not None:
+            return self._items[:n]
+        # a selection keeps n items in memory, also for a one-shot stream, which is consumed by it
+        select = top_k if self._reverse else bottom_k
+        return select(self._take_source(), n, key=self._key)
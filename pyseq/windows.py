@@ -0,0 +1,81 @@
+import math
+from collections import deque
+
+
+def windows(iterable, size, step=1):
+    window = deque(maxlen=size)
+    skip = 0
+    for item in iterable:
+        window.append(item)
+        if skip:
+            skip -= 1
+            continue
+        if len(window) == size:
+            yield tuple(window)
+            skip = step - 1
+
+
+def _non_finite_kind(item):
+    # None for finite values; nan and infinities are kept out of the running total, so they cannot poison it
+    if type(item) is int:
+        return None
+    try:
+        if math.isfinite(item):
+            return None
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return 'nan' if item != item else '+inf' if item > 0 else '-inf'
+
+
+def rolling_sum(iterable, size):
+    window = deque()
+    total = 0
+    non_finite = {'nan': 0, '+inf': 0, '-inf': 0}
+    for item in iterable:
+        kind = _non_finite_kind(item)
+        window.append((item, kind))
+        if kind is None:
+            total += item
+        else:
+            non_finite[kind] += 1
+        if len(window) > size:
+            old, old_kind = window.popleft()
+            if old_kind is None:
+                total -= old
+            else:
+                non_finite[old_kind] -= 1
+        if len(window) == size:
+            if non_finite['nan'] or (non_finite['+inf'] and non_finite['-inf']):
+                yield math.nan
+            elif non_finite['+inf']:
+                yield math.inf
+            elif non_finite['-inf']:
+                yield -math.inf
+            else:
+                yield total
+
+
+def rolling_mean(iterable, size):
+    for total in rolling_sum(iterable, size):
+        yield total / size
+
+
+def _rolling_extreme(iterable, size, better):
+    # monotonic deque of (index, value): values get strictly worse from the front, the front is the window extreme
+    candidates = deque()
+    for index, item in enumerate(iterable):
+        while candidates and not better(candidates[-1][1], item):
+            candidates.pop()
+        candidates.append((index, item))
+        if candidates[0][0] <= index - size:
+            candidates.popleft()
+        if index >= size - 1:
+            yield candidates[0][1]
+
+
+def rolling_min(iterable, size):
+    return _rolling_extreme(iterable, size, lambda kept, new: kept < new)
+
+
+def rolling_max(iterable, size):
+    return _rolling_extreme(iterable, size, lambda kept, new: kept > new)
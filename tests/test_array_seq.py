@@ -0,0 +1,54 @@
+import pytest
+
+from pyseq.array_seq import ArraySeq, _kernel
+from pyseq.opt import Opt
+from pyseq.predicates import between, greater, even, any_of, eq
+from pyseq.seq import Seq
+
+np = pytest.importorskip('numpy')
+
+
+def test_array_seq():
+    arr = np.array([4, 1, 7, 3, 9, 2])
+    assert isinstance(Seq(arr), ArraySeq)
+    assert isinstance(Seq.from_array([1, 2, 3]), ArraySeq)
+    assert not isinstance(Seq(np.zeros((2, 2))), ArraySeq)
+
+    assert isinstance(Seq(arr).filter(greater(3)), ArraySeq)
+    assert Seq(arr).filter(greater(3)).to_list() == [4, 7, 9]
+    assert Seq(arr).take_if(between(2, 4)).to_list() == [4, 3, 2]
+    assert Seq(arr).drop_if(even).to_list() == [1, 7, 3, 9]
+    assert Seq(arr).filter(any_of(1, 9)).to_list() == [1, 9]
+    assert Seq(arr).filter(lambda x: x > 3).to_list() == [4, 7, 9]
+    assert Seq(arr).filter(lambda a: a > 3, vectorized=True).to_list() == [4, 7, 9]
+    assert Seq(arr).map(np.negative).to_list() == [-4, -1, -7, -3, -9, -2]
+    assert Seq(arr).map(lambda a: a * 2, vectorized=True).to_list() == [8, 2, 14, 6, 18, 4]
+    assert Seq(arr).map(lambda x: x * 2).to_list() == [8, 2, 14, 6, 18, 4]
+    assert Seq(arr).sum() == 26
+    assert Seq(arr).min() == Opt.some(1)
+    assert Seq(arr).max() == Opt.some(9)
+    assert Seq(arr).max(lambda x: -x) == Opt.some(1)
+    assert Seq(np.array([])).min() == Opt.none()
+    assert Seq(arr).adjacent_difference().to_list() == [-3, 6, -4, 6, -7]
+    assert Seq(arr).sort().take(3).to_list() == [1, 2, 3]
+    assert Seq(np.array([3, 1, 2])).sort(run_size=2).to_list() == [1, 2, 3]
+    with pytest.raises(ValueError) as e:
+        Seq(np.array([3, 1, 2])).sort(run_size=0)
+    assert __file__ in e.value.args[1]
+    assert Seq(np.array([3, 1, 2])).sort(lambda x: -x).to_list() == [3, 2, 1]
+    assert Seq(arr).reverse().drop(4).to_list() == [1, 4]
+    assert Seq(arr).enumerate().take(2).to_list() == [(0, 4), (1, 1)]
+    assert Seq(arr).len() == 6
+
+    # a list constant is compared with each item as a whole, numpy would broadcast it
+    assert _kernel(eq([1, 2])) is None
+    assert _kernel(any_of([1, 2], 2)) is None
+    assert _kernel(between(1, np.array([2, 3]))) is None
+    pairs = np.empty(2, dtype=object)
+    pairs[0], pairs[1] = (1, 2), (3, 4)
+    assert Seq(pairs).filter(eq((1, 2))).to_list() == [(1, 2)]
+    assert Seq(np.array([1, 2])).filter(eq(np.int64(2))).to_list() == [2]
+    words = np.array(['b', 'a', 'c'], dtype=object)
+    assert Seq(words).sum('') == 'bac'
+    assert Seq(words).min() == Opt.some('a')
+    assert Seq(words).max() == Opt.some('c')
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from pyseq.async_seq import AsyncSeq
+from pyseq.opt import Opt
+from pyseq.seq import Seq
+
+
+async def _agen(n):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+
+
+async def _delayed_square(x):
+    await asyncio.sleep(0.01 * (5 - x))
+    return x * x
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _reverse_completion(n):
+    # each task waits for its own event, which is only set once the result of the following item has arrived,
+    # so the tasks complete from the last item to the first
+    events = [asyncio.Event() for _ in range(n)]
+
+    async def square(x):
+        await events[x].wait()
+        return x * x
+
+    results = []
+    events[-1].set()
+    async for value in AsyncSeq(_agen(n)).map(square, concurrency=n, ordered=False):
+        results.append(value)
+        x = n - len(results)
+        if x > 0:
+            events[x - 1].set()
+    return results
+
+
+async def _pending_after_take(pipeline=lambda seq: seq):
+    async def slow(x):
+        await asyncio.sleep(0 if x < 2 else 10)
+        return x
+
+    # the source belongs to the caller, who closes it, AsyncSeq only closes what it created
+    source = _agen(10)
+    result = await pipeline(AsyncSeq(source).map(slow, concurrency=5)).take(2).to_list()
+    await asyncio.sleep(0)
+    pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    await source.aclose()
+    return result, len(pending)
+
+
+async def _rest_after(consume):
+    source = _agen(5)
+    seq = AsyncSeq(source)
+    return await consume(seq), [item async for item in source]
+
+
+def test_async_seq():
+    assert _run(AsyncSeq(_agen(5)).map(lambda x: x * 2).to_list()) == [0, 2, 4, 6, 8]
+    assert _run(AsyncSeq(_agen(5)).map(_delayed_square).to_list()) == [0, 1, 4, 9, 16]
+    assert _run(AsyncSeq(_agen(5)).map(_delayed_square, concurrency=5).to_list()) == [0, 1, 4, 9, 16]
+    assert _run(_reverse_completion(5)) == [16, 9, 4, 1, 0]
+    assert _run(AsyncSeq(_agen(5)).map(_delayed_square, concurrency=2, ordered=False).to_set()) == {0, 1, 4, 9, 16}
+    assert _run(AsyncSeq(_agen(10)).filter(lambda x: x % 3 == 0).to_list()) == [0, 3, 6, 9]
+    assert _run(AsyncSeq(_agen(10)).take(3).to_tuple()) == (0, 1, 2)
+    assert _run(AsyncSeq(_agen(10)).drop(7).to_list()) == [7, 8, 9]
+    assert _run(AsyncSeq(_agen(7)).chunk(3).to_list()) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert _run(AsyncSeq(_agen(7)).group_by(lambda x: x % 2, result_selector=Seq.to_list).to_dict()) \
+           == {0: [0, 2, 4, 6], 1: [1, 3, 5]}
+    assert _run(AsyncSeq(_agen(3)).enumerate(1).to_dict()) == {1: 0, 2: 1, 3: 2}
+    assert _run(AsyncSeq(_agen(3)).first()) == Opt.some(0)
+    assert _run(AsyncSeq(_agen(0)).first()) == Opt.none()
+    assert _run(Seq.range(4).to_async().map(_delayed_square, concurrency=4).to_list()) == [0, 1, 4, 9]
+    assert _run(AsyncSeq([(1, 2), (3, 4)]).map(lambda a, b: a + b).to_seq()).to_list() == [3, 7]
+    assert _run(AsyncSeq(_agen(100)).map(_delayed_square, concurrency=3).take(2).to_list()) == [0, 1]
+    assert _run(_pending_after_take()) == ([0, 1], 0)
+    assert _run(_pending_after_take(lambda seq: seq.filter(lambda x: x >= 0))) == ([0, 1], 0)
+    assert _run(_pending_after_take(lambda seq: seq.map(lambda x: x).enumerate().drop(0))) == ([(0, 0), (1, 1)], 0)
+    assert _run(_pending_after_take(lambda seq: seq.chunk(1))) == ([[0], [1]], 0)
+    assert _run(_rest_after(AsyncSeq.first)) == (Opt.some(0), [1, 2, 3, 4])
+    assert _run(_rest_after(lambda seq: seq.take(2).to_list())) == ([0, 1], [2, 3, 4])
+    with pytest.raises(ValueError):
+        AsyncSeq(_agen(3)).map(_delayed_square, concurrency=0)
@@ -1,4 +1,7 @@
-from pyseq.functions import invoke_on_key, invoke_on_value, pipe, unpack, compose
+from types import SimpleNamespace
+
+from pyseq.functions import invoke_on_key, invoke_on_value, pipe, unpack, compose, to_unary, getter, getter_key, \
+    split_path, attr
 
 
 def _test_func(func, lst):
@@ -27,3 +30,62 @@ def test_functions():
         lambda k, v: f'{v}_{k * 11}'),
         dct.items()) == ['X_22', 'Y_33']
 
+
+def test_to_unary_cache():
+    to_unary.cache_clear()
+
+    def make_adder(n):
+        return lambda a, b: a + b + n
+
+    assert to_unary(make_adder(1))((1, 2)) == 4
+    assert to_unary(make_adder(2))((1, 2)) == 5
+    assert to_unary(lambda a, b=1: a + b)(1) == 2
+    assert to_unary(str.upper)('x') == 'X'
+    assert to_unary(str.upper)('y') == 'Y'
+
+    info = to_unary.cache_info()
+    assert (info.hits, info.misses, info.uncached) == (2, 3, 0)
+
+    class Unhashable:
+        __hash__ = None
+
+        def __call__(self, a, b):
+            return a * b
+
+    assert to_unary(Unhashable())((3, 4)) == 12
+    assert to_unary.cache_info().uncached == 1
+
+    assert [to_unary(len)('ab'), to_unary(len)('abc'), to_unary(abs)(-1)] == [2, 3, 1]
+    info = to_unary.cache_info()
+    assert (info.hits, info.misses, info.uncached) == (3, 5, 1)
+
+
+def test_getter():
+    record = {'user': {'name': 'Ann', 'orders': [{'total': 10}, {'total': 20}]}, 'id': 7}
+    obj = SimpleNamespace(user=SimpleNamespace(name='Bob', tags=['a', 'b']), data={'class': 1})
+
+    assert split_path('a.b[3].c') == ('a', 'b', 3, 'c')
+    assert split_path('[0][@name]') == (0, attr('name'))
+    assert split_path('a/b', delimiter='/') == ('a', 'b')
+
+    assert getter('id')(record) == 7
+    assert getter('user.orders[1].total')(record) == 20
+    assert getter(('user', 'name'))(record) == 'Ann'
+    assert getter(1)(['x', 'y']) == 'y'
+    assert getter('[1][0]')([[1, 2], [3, 4]]) == 3
+    assert getter('id', 'user.name', len)(record) == (7, 'Ann', 2)
+
+    assert getter('[@user][@name]')(obj) == 'Bob'
+    assert getter('[@user][@tags][1]')(obj) == 'b'
+    assert getter('[@data].class')(obj) == 1
+    assert getter(('user', attr('__class__')))({'user': 1}) is int
+    assert getter((slice(0, 2),))([1, 2, 3]) == [1, 2]
+
+    assert getter('user.orders[1].total').__name__ == 'user.orders.1.total'
+    assert getter('[@user][@name]', 'id').__name__ == '[@user].[@name];id'
+    assert getter_key(getter('a.b')) == getter_key(getter(('a', 'b')))
+    assert getter_key(getter('[@a]')) != getter_key(getter('a'))
+
+    assert getter('@id')({'@id': 1}) == 1
+    assert getter('@graph[0].@type')({'@graph': [{'@type': 'Person'}]}) == 'Person'
+    assert split_path('@id') == ('@id',)
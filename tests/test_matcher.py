@@ -1,6 +1,7 @@
 import pytest
 
 from pyseq.match import create_matcher, when, __, MatchError
+from pyseq.predicates import matches
 
 
 def test_matcher_11():
@@ -29,3 +30,80 @@ def test_matcher_2():
     assert matcher('Ydaspes') == '_YDASPES'
     assert matcher('?') == '@'
     assert matcher('!') == '%'
+
+
+def test_matcher_dispatch():
+    class Base:
+        pass
+
+    class Derived(Base):
+        pass
+
+    def failing_handler(x):
+        return x + None
+
+    matcher = create_matcher(
+        when(0) >> 'zero',
+        when(lambda x: x == 'late') >> 'predicate first',
+        when(bool) >> 'bool',
+        when(int) >> (lambda x: f'int {x}'),
+        when(Base) >> 'base',
+        when(Derived) >> 'derived',
+        when('late') >> 'literal',
+        when((str, bytes)) >> str.upper,
+        when(1.5) >> failing_handler,
+        when(__) >> (lambda: 'other'))
+
+    assert matcher(0) == 'zero'
+    assert matcher(False) == 'zero'
+    assert matcher(True) == 'bool'
+    assert matcher(7) == 'int 7'
+    assert matcher(Derived()) == 'base'
+    assert matcher('late') == 'predicate first'
+    assert matcher('abc') == 'ABC'
+    assert matcher([1]) == 'other'
+    assert matcher(2.5) == 'other'
+    with pytest.raises(TypeError):
+        matcher(1.5)
+
+    nan = float('nan')
+    for share_getters in [False, True]:
+        matcher = create_matcher(when(nan) >> 'nan', when(1.0) >> 'one', when(float) >> 'float',
+                                 share_getters=share_getters)
+        assert [matcher(nan), matcher(1.0), matcher(2.0)] == ['float', 'one', 'float']
+
+
+def test_matcher_shared_getters():
+    from pyseq.predicates import match, matches, any_of, gt
+    calls = []
+
+    class Event(dict):
+        def __getitem__(self, key):
+            calls.append(key)
+            return super().__getitem__(key)
+
+    handlers = [
+        when(matches({'type': 'click', 'x': gt(100)})) >> 'right click',
+        when(match('type', 'click')) >> 'click',
+        when(match('type', any_of('key', 'scroll'))) >> (lambda e: e['type']),
+        when(lambda e: 'x' in e) >> 'positioned',
+        when(__) >> 'unknown',
+    ]
+    plain = create_matcher(*handlers)
+    shared = create_matcher(*handlers, share_getters=True)
+
+    events = [{'type': 'click', 'x': 200}, {'type': 'click', 'x': 5}, {'type': 'key'}, {'type': 'move', 'x': 1},
+              {'type': 'move'}]
+    expected = ['right click', 'click', 'key', 'positioned', 'unknown']
+    assert [plain(Event(e)) for e in events] == expected
+    assert [shared(Event(e)) for e in events] == expected
+
+    calls.clear()
+    shared(Event({'type': 'move', 'x': 1}))
+    assert calls == ['type']
+
+
+def test_matcher_empty_filter():
+    for share_getters in [False, True]:
+        matcher = create_matcher(when(matches({})) >> 'any', share_getters=share_getters)
+        assert matcher({'a': 1}) == 'any'
@@ -1,3 +1,5 @@
+import copy
+import pickle
 from math import sqrt
 
 import pytest
@@ -78,4 +80,38 @@ def test_opt():
     assert Opt.some(dct).getitem('name', 'middle') == Opt.none()
     assert Opt.some(dct).getitem('name', 'number', 0, 2) == Opt.some(44)
     assert Opt.some(dct).getitem('name', 'middle') == Opt.none()
-    
\ No newline at end of file
+    
+
+def test_error_location():
+    with pytest.raises(OptError) as e:
+        Opt.some(None)
+    message, location = e.value.args
+    assert message == 'value expected, got None'
+    line = e.tb.tb_lineno
+    assert str(location) == f'File "{__file__}", line {line}, in test_error_location'
+    assert location == str(location)
+    assert __file__ in location
+    assert str(e.value) == str(('value expected, got None', str(location)))
+    assert pickle.loads(pickle.dumps(e.value)).args == ('value expected, got None', str(location))
+
+
+def test_opt_representation():
+    assert Opt.none() is Opt.none()
+    assert Opt(None) is Opt.none()
+    assert Opt(Opt.none()) is Opt.none()
+    assert Opt.of(1).filter(lambda x: x > 1) is Opt.none()
+    assert not hasattr(Opt.of(1), '__dict__')
+
+    assert copy.copy(Opt.of(5)) == Opt.of(5)
+    assert pickle.loads(pickle.dumps(Opt.of([1, 2]))) == Opt.of([1, 2])
+    assert pickle.loads(pickle.dumps(Opt.none())) is Opt.none()
+    assert Opt.none().get_or_none() is None
+
+    data = {'user': {'address': None, 'tags': ['a']}}
+    assert Opt.of(data).getitem('user', 'tags', 0) == Opt.some('a')
+    assert Opt.of(data).getitem('user', 'address', 'city') is Opt.none()
+    assert Opt.of(data).getitem('user', 'phone') is Opt.none()
+    assert Opt.of(data).getitem() == Opt.some(data)
+    assert Opt.of(1 + 2j).getattr('real', 'is_integer') != Opt.none()
+    assert Opt.of(1 + 2j).getattr('real', 'missing') is Opt.none()
+    assert Opt.none().getattr('real') is Opt.none()
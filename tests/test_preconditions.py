@@ -0,0 +1,162 @@
+import gc
+
+import pytest
+
+from pyseq.predicates import gt, not_none
+from pyseq.preconditions import check_annotation, pre, post, value_of, PreconditionError, PostconditionError, \
+    set_checking_policy, get_checking_policy, check_stats, CheckCounts, ALWAYS, SAMPLED, OFF
+
+
+def test_check_annotation():
+    @check_annotation
+    def func(a: int, b: [int, gt(0)], scale: (int, float) = 1.0) -> float:
+        return (a + b) * scale
+
+    assert func(1, 2) == 3.0
+    assert func(1, b=2, scale=2.0) == 6.0
+    assert func.__name__ == 'func'
+
+    with pytest.raises(PreconditionError) as e:
+        func('1', 2)
+    assert e.value.args[0] == 'func: argument "a": expected = int; actual = 1 <str>'
+
+    with pytest.raises(PreconditionError) as e:
+        func(1, b=-2)
+    assert e.value.args[0] == 'func: argument "b": expected = greater than 0; actual = -2 <int>'
+    assert __file__ in e.value.args[1]
+
+    with pytest.raises(PreconditionError) as e:
+        func(1, 2, scale='x')
+    assert e.value.args[0] == 'func: argument "scale": expected = int,float; actual = x <str>'
+
+    with pytest.raises(PostconditionError) as e:
+        func(1, 2, scale=2)
+    assert e.value.args[0] == 'func: return_value: expected = float; actual = 6 <int>'
+
+    with pytest.raises(TypeError):
+        func(1)
+
+
+def test_default_value_is_not_checked():
+    @check_annotation
+    def func(a: int, b: int = None, *args: tuple, c: int, d: int = None, **kwargs: dict):
+        return a, b, args, c, d, kwargs
+
+    assert func(1, c=2) == (1, None, (), 2, None, {})
+    assert func(1, 2, 3, c=4, d=5, e=6) == (1, 2, (3,), 4, 5, {'e': 6})
+
+    with pytest.raises(PreconditionError):
+        func(1, b=None, c=2)
+    with pytest.raises(PreconditionError):
+        func(1, c=2, d=None)
+    with pytest.raises(TypeError):
+        func(1, 2)
+
+
+def test_positional_only():
+    @check_annotation
+    def func(a: int, /, b: int = 0):
+        return a + b
+
+    assert func(1, 2) == 3
+    with pytest.raises(TypeError):
+        func(a=1)
+    with pytest.raises(PreconditionError):
+        func(1.0)
+
+
+def test_stacked_decorators():
+    @pre('a', int)
+    @pre('b', gt(0))
+    @post(not_none)
+    def func(a, b):
+        return a if a > 0 else None
+
+    assert func(1, 2) == 1
+    with pytest.raises(PreconditionError):
+        func('1', 2)
+    with pytest.raises(PreconditionError):
+        func(1, 0)
+    with pytest.raises(PostconditionError):
+        func(-1, 2)
+
+
+def test_method():
+    class Account:
+        def __init__(self):
+            self.balance = 0
+
+        @check_annotation
+        def deposit(self, amount: [int, gt(0)]) -> int:
+            self.balance += amount
+            return self.balance
+
+    account = Account()
+    assert account.deposit(10) == 10
+    assert account.deposit(amount=5) == 15
+    with pytest.raises(PreconditionError):
+        account.deposit(-1)
+
+
+def test_checking_policy():
+    def func(a: int) -> int:
+        return a
+
+    def use_value_of(a):
+        return value_of(a, 'a').ensure(int)
+
+    assert get_checking_policy() == (ALWAYS, 1)
+    checked = check_annotation(func)
+    for a in [1, 2, 3]:
+        assert checked(a) == a
+        assert use_value_of(a) == a
+    for a in ['1', '2']:
+        with pytest.raises(PreconditionError):
+            checked(a)
+        with pytest.raises(RuntimeError):
+            use_value_of(a)
+    assert checked.check_stats.checked == 5
+    assert checked.check_stats.violations == 2
+    assert check_stats()[f'{__name__}.test_checking_policy.<locals>.func'] == CheckCounts(5, 0, 2)
+    assert f'{__name__}.test_checking_policy.<locals>.use_value_of' not in check_stats()
+
+    try:
+        assert set_checking_policy(SAMPLED, 3) == (ALWAYS, 1)
+        sampled = pre('a', int)(func)
+        assert sampled(1) == 1
+        assert sampled('2') == '2'
+        assert sampled('3') == '3'
+        with pytest.raises(PreconditionError):
+            sampled('4')
+        assert (sampled.check_stats.checked, sampled.check_stats.skipped, sampled.check_stats.violations) == (2, 2, 1)
+        assert [use_value_of(a) for a in [1, 'x', 'y']] == [1, 'x', 'y']
+
+        def two_checks(x, y):
+            value_of(x, 'x').ensure(int)
+            value_of(y, 'y').ensure(int)
+
+        set_checking_policy(SAMPLED, 2)
+        two_checks(1, 1)
+        two_checks(1, 'y')
+        with pytest.raises(RuntimeError, match='y: expected = int'):
+            two_checks(1, 'y')
+        assert check_stats()[f'{__name__}.test_checking_policy.<locals>.two_checks'] == CheckCounts(4, 2, 1)
+
+        namespace = {'value_of': value_of}
+        exec('def generated(x):\n    return value_of(x).ensure(int)', namespace)
+        assert namespace['generated'](1) == 1
+        assert 'generated' in check_stats()
+        del namespace
+        gc.collect()
+        assert 'generated' not in check_stats()
+
+        assert set_checking_policy(OFF) == (SAMPLED, 2)
+        assert check_annotation(func) is func
+        assert pre('a', int)(func) is func
+        assert use_value_of('z') == 'z'
+    finally:
+        set_checking_policy(ALWAYS)
+
+    assert check_stats()[f'{__name__}.test_checking_policy.<locals>.use_value_of'] == CheckCounts(1, 2, 0)
+    with pytest.raises(ValueError):
+        set_checking_policy('never')
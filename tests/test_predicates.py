@@ -1,11 +1,17 @@
+import time
+
 from pyseq.predicates import *
 
 
 def _test_pred(pred, pos, neg):
+    compiled = pred.compile()
+    assert compiled.__name__ == pred.__name__
     for item in pos:
         assert pred(item)
+        assert compiled(item)
     for item in neg:
         assert not pred(item)
+        assert not compiled(item)
 
 
 def test_predicates():
@@ -90,3 +96,113 @@ def test_predicates():
     _test_pred(inside([1, 2, 49]),
                pos=[1, 2, 49],
                neg=[0, 3, 8])
+
+
+def test_compiled_predicates():
+    calls = []
+
+    def get_b(item):
+        calls.append(item)
+        return item['b']
+
+    pred = any_of(None) | matches({'a': between(1, 5) & ~eq(3)}) & match(get_b, gt(0) & lt(10) & ~even)
+    compiled = pred.compile()
+    items = [None, {'a': 2, 'b': 3}, {'a': 3, 'b': 3}, {'a': 4, 'b': 4}, {'a': 9, 'b': 1}, {'a': 1, 'b': 11}]
+    assert [compiled(item) for item in items] == [pred(item) for item in items] == [True, True, False, False, False,
+                                                                                    False]
+    calls.clear()
+    compiled({'a': 2, 'b': 3})
+    assert len(calls) == 1
+    compiled({'a': 3, 'b': 3})
+    assert len(calls) == 1
+
+    _test_pred(Predicate.none(lt(0), gt(10), lambda x: x == 5),
+               pos=[0, 4, 6, 10],
+               neg=[-1, 5, 11])
+    _test_pred(even ^ lt(3),
+               pos=[1, 4, 6],
+               neg=[0, 2, 3, 5])
+    _test_pred(odd & of_type(int),
+               pos=[1, 3],
+               neg=[2, 4])
+
+    for empty in [matches({}), contains_all_of(), Predicate.all(), Predicate.none()]:
+        assert empty([1]) is True
+        assert empty.compile()([1]) is True
+    assert Predicate.any()(1) is False
+    assert Predicate.any().compile()(1) is False
+
+    # a variable is used where its getter was not evaluated, after an unused inner match or a constant 'False and'
+    nested = match('a', match('b', Predicate.all()) & match('c', gt(0)))
+    assert nested({'a': {'b': 1, 'c': 2}}) is True
+    assert nested.compile()({'a': {'b': 1, 'c': 2}}) is True
+    skipped = match('a', Predicate.any(Predicate.all(Predicate.any(), gt(0)), lt(5)))
+    assert [skipped({'a': x}) for x in (1, 7)] == [skipped.compile()({'a': x}) for x in (1, 7)] == [True, False]
+
+
+def test_predicate_names():
+    assert str(between(1, 9)) == 'between 1 and 9'
+    assert str(gt(0) & ~eq(3)) == '(greater than 0) and (not (equal to 3))'
+    assert str(matches({'a': between(1, 9), 'b.c': any_of(1, 2)})) == 'all [a:between 1 and 9;b.c:any of 1;2]'
+    assert approx_equal(value=1.0, abs_tol=0.1).__name__ == 'approx equal to 1.0'
+    assert contains_all_of(1, 2).compile().__name__ == 'contains all of 1;2'
+
+
+def test_adaptive_predicates():
+    def slow_even(x):
+        time.sleep(0.00005)
+        return x % 2 == 0
+
+    rare = lt(5).alias('rare')
+    pred = Predicate.all(slow_even, rare, gt(-1), adaptive=True, window=20, sample_every=2)
+    assert pred.order[:2] == (slow_even, rare)
+    for x in range(200):
+        assert pred(x) == (x % 2 == 0 and x < 5)
+    assert pred.order[0] is rare
+    assert pred.order[1] is slow_even  # the clause that always passes never decides, so it goes last
+
+    frozen = pred.freeze()
+    assert str(frozen) == str(pred)
+    _test_pred(frozen, pos=[0, 2, 4], neg=[1, 6, 8])
+
+    pred = Predicate.any(slow_even, gt(2), adaptive=True, window=10, sample_every=1)
+    assert [pred(x) for x in range(10)] == [True, False, True, True, True, True, True, True, True, True]
+    for x in range(30):
+        pred(x)
+    assert pred.order[0] is not slow_even
+
+    guarded = Predicate.all(not_none, lambda x: x > 3, adaptive=True, window=4, sample_every=2)
+    items = [None, 5, None, 1, None, 7] * 10
+    assert [guarded(x) for x in items] == [Predicate.all(not_none, lambda x: x > 3)(x) for x in items]
+    assert guarded.order[0] is not_none
+    calls = []
+    logged = Predicate.all(lambda x: calls.append(x) or x > 0, lambda x: x < 10, adaptive=True, sample_every=1)
+    assert logged(-1) is False
+    assert calls == [-1]
+
+
+def test_substring_search():
+    _test_pred(has_sub([2, 3]),
+               pos=[[1, 2, 3], [2, 2, 3, 4]],
+               neg=[[], [3, 2], [2, 1, 3], (2, 3), 'x', 'xyz'])
+    _test_pred(has_sub(range(2, 4)),
+               pos=[range(5), range(2, 4)],
+               neg=[range(3), [2, 3]])
+    _test_pred(has_sub(b'ab'),
+               pos=[b'cab', bytearray(b'abc')],
+               neg=[b'', b'a'])
+    _test_pred(has_sub(''),
+               pos=['a'],
+               neg=[''])
+
+    keywords = [f'kw{i:03}' for i in range(200)] + ['error']
+    _test_pred(contains_any_of(*keywords),
+               pos=['an error occurred', 'see kw117', ['error']],
+               neg=['all fine', 'kw2', []])
+    _test_pred(contains_none_of(*keywords),
+               pos=['all fine'],
+               neg=['fatal error'])
+    _test_pred(contains_all_of(*keywords[:150]),
+               pos=[' '.join(keywords)],
+               neg=[' '.join(keywords[1:])])
+    assert str(contains_any_of(*keywords)).startswith('contains any of kw000;kw001')
@@ -1,6 +1,12 @@
+import math
 import operator
+import sys
+import threading
 
-from pyseq.functions import identity
+import pytest
+
+from pyseq import sorting
+from pyseq.functions import identity, aggregate
 from pyseq.opt import Opt
 from pyseq.seq import Seq
 
@@ -94,3 +100,273 @@ def test_seq():
             .drop_until(lambda a, b: a == 3) \
             .drop_if(lambda a, b: b == 8) \
             .to_dict() == {3: 4, 5: 6}
+
+
+def test_seq_fusion():
+    _test_seq(
+        Seq.range(20).map(lambda x: x * 3).filter(lambda x: x % 2 == 0).map(lambda x: x + 1).drop_if(lambda x: x > 40)
+        .replace_if(lambda x: x == 13, -1).replace(7, -7).take_if(lambda x: x != 19),
+        [1, -7, -1, 25, 31, 37])
+    _test_seq(Seq([(1, 2), (3, 4)]).map(lambda a, b: a * b).filter(lambda x: x > 2), [12])
+
+    source = Seq([1, 2, 3, 4, 5]).map(lambda x: 10 * x)
+    derived = source.filter(lambda x: x != 20)
+    assert next(iter(derived)) == 10
+    assert next(iter(source)) == 20
+    _test_seq(derived, [30, 40, 50])
+    _test_seq(source, [])
+
+    assert not hasattr(Seq([1]), '__dict__')
+    pipeline = Seq([1, 2, 3]).map(lambda x: x + 1)
+    appended = pipeline.append(5)
+    assert type(appended) is Seq
+    _test_seq(appended, [2, 3, 4, 5])
+    _test_seq(Seq([1, 2, 3, 4]).take_until(lambda x: x == 3), [1, 2])
+    _test_seq(Seq([1, 2, 3, 4]).drop_until(lambda x: x == 3), [3, 4])
+
+    def fail_on_two(x):
+        if x == 2:
+            raise ValueError(x)
+        return x
+
+    for seq in [Seq([1, 2, 3]).map(fail_on_two), Seq([1, 2, 3]).map(fail_on_two).filter(lambda x: x > 0).map(str)]:
+        it = iter(seq)
+        assert next(it) in (1, '1')
+        with pytest.raises(ValueError):
+            next(it)
+        assert list(it) in ([3], ['3'])
+        assert list(it) == []
+
+
+def _square(x):
+    return x * x
+
+
+def test_seq_parallel():
+    _test_seq(Seq.range(10).par_map(lambda x: x * 2, max_workers=3), [0, 2, 4, 6, 8, 10, 12, 14, 16, 18])
+    _test_seq(Seq([(1, 2), (3, 4)]).par_map(lambda a, b: a + b, chunk_size=2), [3, 7])
+    _test_seq(Seq.range(10).par_filter(lambda x: x % 3 == 0, chunk_size=4), [0, 3, 6, 9])
+    assert sorted(Seq.range(20).par_map(_square, ordered=False, chunk_size=3)) == [x * x for x in range(20)]
+    _test_seq(Seq.count().par_map(_square, max_pending=2).take(4), [0, 1, 4, 9])
+    _test_seq(Seq.range(6).par_map(_square, executor='process', max_workers=2, chunk_size=2).chunk(4),
+              [[0, 1, 4, 9], [16, 25]])
+    with pytest.raises(ValueError):
+        Seq.range(3).par_map(_square, executor='gpu')
+
+
+def test_seq_top_k(monkeypatch):
+    items = [('a', 3), ('b', 1), ('c', 3), ('d', 2), ('e', 1), ('f', 3)]
+    _test_seq(Seq(items).top_k(2, lambda k, v: v), [('a', 3), ('c', 3)])
+    _test_seq(Seq(items).bottom_k(3, lambda k, v: v), [('b', 1), ('e', 1), ('d', 2)])
+    _test_seq(Seq([5, 1, 4]).nlargest(5), [5, 4, 1])
+    _test_seq(Seq([5, 1, 4]).nsmallest(0), [])
+    _test_seq(Seq(iter(items)).sort(lambda k, v: v).take(3), [('b', 1), ('e', 1), ('d', 2)])
+    _test_seq(Seq(iter(items)).sort_desc(lambda k, v: v).take(4), [('a', 3), ('c', 3), ('f', 3), ('d', 2)])
+    _test_seq(Seq([3, 1, 2]).sort().reverse(), [3, 2, 1])
+
+    sorted_seq = Seq([3, 1, 2]).sort()
+    _test_seq(sorted_seq.take(2), [1, 2])
+    assert sorted_seq.to_list() == [1, 2, 3]
+
+    items = [3, 1]
+    sorted_seq = Seq(items).sort()
+    items.append(2)
+    assert sorted_seq.to_list() == [1, 2, 3]
+
+    sorted_seq = Seq(iter([3, 1, 2])).sort()
+    _test_seq(sorted_seq.take(2), [1, 2])
+    with pytest.raises(RuntimeError, match='already consumed'):
+        sorted_seq.to_list()
+    sorted_seq = Seq(iter([3, 1, 2])).sort_desc()
+    assert sorted_seq.to_list() == [3, 2, 1]
+    _test_seq(sorted_seq.take(1), [3])
+
+    monkeypatch.setattr(sorting, 'sorted', None, raising=False)
+    _test_seq(Seq(x for x in range(100000)).map(lambda x: -x).sort().take(3), [-99999, -99998, -99997])
+    _test_seq(Seq.range(1000).filter(lambda x: x % 3).sort_desc().take(2), [998, 997])
+
+
+def test_seq_external_sort(monkeypatch):
+    items = [(i * 7919 % 101, i) for i in range(300)]
+    assert Seq(iter(items)).sort(lambda k, v: k, run_size=16).to_list() == sorted(items, key=lambda x: x[0])
+    assert Seq(items).sort_desc(lambda k, v: k, run_size=7).to_list() == sorted(items, key=lambda x: x[0],
+                                                                                reverse=True)
+    _test_seq(Seq([3, 1, 2]).sort(run_size=10), [1, 2, 3])
+    _test_seq(Seq.range(10).map(lambda x: -x).sort(run_size=3).take(4), [-9, -8, -7, -6])
+    with pytest.raises(ValueError, match='sort: positive run_size expected') as e:
+        Seq([3, 1, 2]).sort(run_size=0)
+    assert __file__ in e.value.args[1]
+    with pytest.raises(ValueError):
+        Seq([3, 1, 2]).sort_desc(run_size=-1)
+
+    items = [(i * 7919 % 101, i) for i in range(3000)]
+    expected = sorted(items, key=lambda x: x[0])
+    real_sorted = sorted
+
+    def bounded_sorted(iterable, **kwargs):
+        result = real_sorted(iterable, **kwargs)
+        assert len(result) <= 100
+        return result
+
+    monkeypatch.setattr(sorting, 'sorted', bounded_sorted, raising=False)
+    _test_seq(Seq(iter(items)).sort(lambda k, v: k, run_size=100).take(5), expected[:5])
+    _test_seq(Seq(iter(items)).sort_desc(lambda k, v: k, run_size=100).take(5),
+              real_sorted(items, key=lambda x: x[0], reverse=True)[:5])
+    _test_seq(Seq(iter(items)).sort(lambda k, v: k, run_size=100).reverse(), expected[::-1])
+    _test_seq(Seq(iter(items)).sort_desc(lambda k, v: k, run_size=100).reverse(),
+              real_sorted(items, key=lambda x: x[0], reverse=True)[::-1])
+    assert len(Seq(items).sort(run_size=100)._iterable) == 3000
+    with pytest.raises(TypeError):
+        len(Seq(iter(items)).sort(run_size=100)._iterable)
+
+
+def test_seq_group_by_modes():
+    _test_seq(Seq('aabccca').group_by_adjacent(identity, identity, Seq.to_str),
+              [('a', 'aa'), ('b', 'b'), ('c', 'ccc'), ('a', 'a')])
+    _test_seq(Seq([(1, 'x'), (1, 'y'), (2, 'z')]).group_by_adjacent(result_selector=Seq.to_list),
+              [(1, ['x', 'y']), (2, ['z'])])
+    words = ['apple', 'avocado', 'banana', 'blueberry', 'cherry', 'apricot']
+    assert Seq(words).aggregate_by(lambda w: w[0], len).to_dict() == {'a': 19, 'b': 15, 'c': 6}
+    assert Seq(words).aggregate_by(lambda w: w[0], identity, max).to_dict() == \
+           {'a': 'avocado', 'b': 'blueberry', 'c': 'cherry'}
+    mean = aggregate(lambda acc, v: (acc[0] + v, acc[1] + 1), init=lambda: (0, 0), finish=lambda acc: acc[0] / acc[1])
+    assert Seq.range(10).aggregate_by(lambda x: x % 2, identity, mean).to_dict() == {0: 4.0, 1: 5.0}
+
+
+def test_seq_joins():
+    users = [(1, 'ann'), (2, 'bob'), (3, 'cid')]
+    orders = [('o1', 1), ('o2', 3), ('o3', 1), ('o4', 9)]
+    user_id = operator.itemgetter(0)
+    order_user = operator.itemgetter(1)
+
+    _test_seq(Seq(users).inner_join(orders, user_id, order_user, lambda u, o: (u[1], o[0])),
+              [('ann', 'o1'), ('cid', 'o2'), ('ann', 'o3')])
+    _test_seq(Seq(iter(users)).inner_join(orders, user_id, order_user, lambda u, o: (u[1], o[0])),
+              [('ann', 'o1'), ('ann', 'o3'), ('cid', 'o2')])
+    assert sorted(Seq(orders).inner_join(users, order_user, user_id, lambda o, u: (u[1], o[0]))) == \
+           [('ann', 'o1'), ('ann', 'o3'), ('cid', 'o2')]
+    _test_seq(Seq(users).left_join(orders, user_id, order_user, lambda u, o: (u[1], o and o[0])),
+              [('ann', 'o1'), ('ann', 'o3'), ('bob', None), ('cid', 'o2')])
+    _test_seq(Seq(users).semi_join(orders, user_id, order_user), [(1, 'ann'), (3, 'cid')])
+    _test_seq(Seq(users).anti_join(orders, user_id, order_user), [(2, 'bob')])
+    _test_seq(Seq([1, 2, 2, 3, 5]).semi_join([2, 5, 7]), [2, 2, 5])
+    read = []
+    lazy_joins = [Seq([1, 2]).semi_join(Seq([2]).inspect(read.append)),
+                  Seq([1, 2]).anti_join(Seq([2]).inspect(read.append))]
+    assert read == []
+    assert [seq.to_list() for seq in lazy_joins] == [[2], [1]]
+    assert read == [2, 2]
+    _test_seq(Seq([1, 2, 2, 3, 5, 5]).merge_join(iter([0, 2, 2, 4, 5])),
+              [(2, 2), (2, 2), (2, 2), (2, 2), (5, 5), (5, 5)])
+    _test_seq(Seq(iter(users)).merge_join(sorted(orders, key=order_user), user_id, order_user,
+                                          lambda u, o: o[0]),
+              ['o1', 'o3', 'o2'])
+    _test_seq(Seq([]).merge_join([1, 2]), [])
+
+
+def test_seq_split_by():
+    calls = []
+
+    def is_even(x):
+        calls.append(x)
+        return x % 2 == 0
+
+    evens, odds = Seq.range(6).partition(is_even)
+    assert odds.to_list() == [1, 3, 5]
+    assert evens.to_list() == [0, 2, 4]
+    assert calls == [0, 1, 2, 3, 4, 5]
+
+    evens, odds = Seq.range(6).partition(lambda x: x % 2 == 0, eager=True)
+    assert (evens.to_list(), odds.to_list()) == ([0, 2, 4], [1, 3, 5])
+
+    small, medium, large = Seq([5, 50, 500, 7, 5000, 70]).split_by(lambda x: len(str(x)), (1, 2, 3))
+    assert large.to_list() == [500]
+    assert medium.to_list() == [50, 70]
+    assert small.to_list() == [5, 7]
+
+    evens, odds = Seq.range(10).partition(lambda x: x % 2 == 0, max_buffer=2)
+    with pytest.raises(BufferError):
+        evens.to_list()
+
+    assert Seq.range(10).partition(lambda x: x % 2 == 0, max_buffer=2)[0].to_list() == [0, 2, 4, 6, 8]
+    evens, odds = Seq.range(10).partition(lambda x: x % 2 == 0, max_buffer=2)
+    del odds
+    assert evens.to_list() == [0, 2, 4, 6, 8]
+    with pytest.raises(ValueError):
+        Seq.range(3).split_by(lambda x: 1, (1, 1))
+
+    _test_seq(Seq([1]).adjacent(), [])
+    _test_seq(Seq(iter([1, 2, 4])).adjacent(), [(1, 2), (2, 4)])
+
+
+def test_seq_cache():
+    pulled = []
+    seq = Seq.range(5).inspect(pulled.append).cache()
+    assert seq.first() == Opt.some(0)
+    assert pulled == [0]
+    assert seq.len() == 5
+    assert seq.to_list() == [0, 1, 2, 3, 4]
+    assert pulled == [0, 1, 2, 3, 4]
+    assert seq.cache() is seq
+
+    seq = Seq.count().map(lambda x: x * 10).cache()
+    it1, it2 = iter(seq), iter(seq)
+    assert [next(it1), next(it1), next(it2), next(it1), next(it2)] == [0, 10, 0, 20, 10]
+
+    seq = Seq.range(10).cache(max_size=3)
+    _test_seq(seq.take(6), [0, 1, 2, 3, 4, 5])
+    with pytest.raises(BufferError):
+        seq.to_list()
+
+    seq = Seq.range(20000).cache(max_size=50)
+    results = [[] for _ in range(4)]
+
+    def consume(result):
+        try:
+            for item in seq:
+                result.append(item)
+        except BufferError:
+            pass
+
+    threads = [threading.Thread(target=consume, args=(result,)) for result in results]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    for result in results:
+        assert result == list(range(len(result)))
+
+
+def test_seq_windows():
+    _test_seq(Seq.range(5).window(3), [(0, 1, 2), (1, 2, 3), (2, 3, 4)])
+    _test_seq(Seq.range(7).window(3, step=2), [(0, 1, 2), (2, 3, 4), (4, 5, 6)])
+    _test_seq(Seq.range(8).window(2, step=3), [(0, 1), (3, 4), (6, 7)])
+    _test_seq(Seq.range(2).window(3), [])
+    data = [5, 1, 4, 4, 2, 8, 0, 3]
+    _test_seq(Seq(data).rolling_sum(3), [10, 9, 10, 14, 10, 11])
+    _test_seq(Seq(data).rolling_mean(2), [3.0, 2.5, 4.0, 3.0, 5.0, 4.0, 1.5])
+    _test_seq(Seq(data).rolling_min(3), [1, 1, 2, 2, 0, 0])
+    _test_seq(Seq(data).rolling_max(3), [5, 4, 4, 8, 8, 8])
+    _test_seq(Seq(data).rolling_max(1), data)
+    with pytest.raises(ValueError):
+        Seq(data).window(0)
+
+    nan, inf = math.nan, math.inf
+    assert str(Seq([1, nan, 2, 3, 4, 5]).rolling_sum(2).to_list()) == str([nan, nan, 5, 7, 9])
+    assert str(Seq([1, inf, 2, -inf, 3, 4]).rolling_sum(2).to_list()) == str([inf, inf, -inf, -inf, 7])
+    assert str(Seq([inf, -inf, 1.5, 2]).rolling_sum(3).to_list()) == str([nan, -inf])
+    assert str(Seq([1.0, nan, 3.0, 5.0]).rolling_mean(2).to_list()) == str([nan, nan, 4.0])
+
+
+def test_seq_approximate_distinct():
+    _test_seq(Seq([5, 1, 2, 1, 3, 1, 4]).unique(approximate=True, capacity=100), [5, 1, 2, 3, 4])
+    _test_seq(Seq(['a', 'B', 'b', 'A']).unique(str.lower, approximate=True, capacity=100), ['a', 'B'])
+    assert Seq.range(20000).map(lambda x: x % 5000).unique(approximate=True, capacity=5000).len() > 4900
+    assert Seq([1, 2, 2, 3]).count_distinct() == 3
+    assert abs(Seq.range(100000).map(lambda x: f'id-{x % 30000}').count_distinct() - 30000) < 30000 * 0.03
+    assert abs(Seq.range(50000).count_distinct(lambda x: x // 2, precision=12) - 25000) < 25000 * 0.06